@@ -1,10 +1,24 @@
 # Author: Joelene Hales, 2024
 
 import numpy as np
-import glm
+import functools
+import itertools
+import math
 import os
 import sys
 
+try:
+    import numba
+    prange = numba.prange
+except ImportError:  # Numba is optional and only accelerates marching_cubes_jit
+    numba = None
+    prange = range
+
+try:
+    import cupy
+except ImportError:  # CuPy is optional and only used when running on the GPU
+    cupy = None
+
 
 # Scalar fields
 def wavy(x, y, z):
@@ -20,11 +34,435 @@ def hyperboloid(x, y, z):
     return x**2 - y**2 - z**2 - z
 
 
+# Lookup table for the marching cubes algorithm. Each index of the table
+# corresponds to one case of marching cubes. Each list element corresponds to
+# one edge of the cube.
+_LOOKUP_TABLE = [
+    [],
+    [0, 8, 3],    # Index 1: back bottom left corner of cube
+    [0, 1, 9],    # Index 2: back bottom right corner of cube 
+    [1, 8, 3, 9, 8, 1],
+    [1, 2, 10],   # Index 4: front bottom right corner of cube
+    [0, 8, 3, 1, 2, 10],
+    [9, 2, 10, 0, 2, 9],
+    [2, 8, 3, 2, 10, 8, 10, 9, 8],
+    [3, 11, 2],   # Index 8: front bottom left corner of cube
+    [0, 11, 2, 8, 11, 0],
+    [1, 9, 0, 2, 3, 11],
+    [1, 11, 2, 1, 9, 11, 9, 8, 11],
+    [3, 10, 1, 11, 10, 3],
+    [0, 10, 1, 0, 8, 10, 8, 11, 10],
+    [3, 9, 0, 3, 11, 9, 11, 10, 9],
+    [9, 8, 10, 10, 8, 11],
+    [4, 7, 8],   # Index 16: bottom top left corner of cube
+    [4, 3, 0, 7, 3, 4],
+    [0, 1, 9, 8, 4, 7],
+    [4, 1, 9, 4, 7, 1, 7, 3, 1],
+    [1, 2, 10, 8, 4, 7],
+    [3, 4, 7, 3, 0, 4, 1, 2, 10],
+    [9, 2, 10, 9, 0, 2, 8, 4, 7],
+    [2, 10, 9, 2, 9, 7, 2, 7, 3, 7, 9, 4],
+    [8, 4, 7, 3, 11, 2],
+    [11, 4, 7, 11, 2, 4, 2, 0, 4],
+    [9, 0, 1, 8, 4, 7, 2, 3, 11],
+    [4, 7, 11, 9, 4, 11, 9, 11, 2, 9, 2, 1],
+    [3, 10, 1, 3, 11, 10, 7, 8, 4],
+    [1, 11, 10, 1, 4, 11, 1, 0, 4, 7, 11, 4],
+    [4, 7, 8, 9, 0, 11, 9, 11, 10, 11, 0, 3],
+    [4, 7, 11, 4, 11, 9, 9, 11, 10],
+    [9, 5, 4],   # Index 32: bottom top right corner of cube
+    [9, 5, 4, 0, 8, 3],
+    [0, 5, 4, 1, 5, 0],
+    [8, 5, 4, 8, 3, 5, 3, 1, 5],
+    [1, 2, 10, 9, 5, 4],
+    [3, 0, 8, 1, 2, 10, 4, 9, 5],
+    [5, 2, 10, 5, 4, 2, 4, 0, 2],
+    [2, 10, 5, 3, 2, 5, 3, 5, 4, 3, 4, 8],
+    [9, 5, 4, 2, 3, 11],
+    [0, 11, 2, 0, 8, 11, 4, 9, 5],
+    [0, 5, 4, 0, 1, 5, 2, 3, 11],
+    [2, 1, 5, 2, 5, 8, 2, 8, 11, 4, 8, 5],
+    [10, 3, 11, 10, 1, 3, 9, 5, 4],
+    [4, 9, 5, 0, 8, 1, 8, 10, 1, 8, 11, 10],
+    [5, 4, 0, 5, 0, 11, 5, 11, 10, 11, 0, 3],
+    [5, 4, 8, 5, 8, 10, 10, 8, 11],
+    [9, 7, 8, 5, 7, 9],
+    [9, 3, 0, 9, 5, 3, 5, 7, 3],
+    [0, 7, 8, 0, 1, 7, 1, 5, 7],
+    [1, 5, 3, 3, 5, 7],
+    [9, 7, 8, 9, 5, 7, 10, 1, 2],
+    [10, 1, 2, 9, 5, 0, 5, 3, 0, 5, 7, 3],
+    [8, 0, 2, 8, 2, 5, 8, 5, 7, 10, 5, 2],
+    [2, 10, 5, 2, 5, 3, 3, 5, 7],
+    [7, 9, 5, 7, 8, 9, 3, 11, 2],
+    [9, 5, 7, 9, 7, 2, 9, 2, 0, 2, 7, 11],
+    [2, 3, 11, 0, 1, 8, 1, 7, 8, 1, 5, 7],
+    [11, 2, 1, 11, 1, 7, 7, 1, 5],
+    [9, 5, 8, 8, 5, 7, 10, 1, 3, 10, 3, 11],
+    [5, 7, 0, 5, 0, 9, 7, 11, 0, 1, 0, 10, 11, 10, 0],
+    [11, 10, 0, 11, 0, 3, 10, 5, 0, 8, 0, 7, 5, 7, 0],
+    [11, 10, 5, 7, 11, 5],
+    [10, 6, 5],   # Index 64: front top right corner of cube
+    [0, 8, 3, 5, 10, 6],
+    [9, 0, 1, 5, 10, 6],
+    [1, 8, 3, 1, 9, 8, 5, 10, 6],
+    [1, 6, 5, 2, 6, 1],
+    [1, 6, 5, 1, 2, 6, 3, 0, 8],
+    [9, 6, 5, 9, 0, 6, 0, 2, 6],
+    [5, 9, 8, 5, 8, 2, 5, 2, 6, 3, 2, 8],
+    [2, 3, 11, 10, 6, 5],
+    [11, 0, 8, 11, 2, 0, 10, 6, 5],
+    [0, 1, 9, 2, 3, 11, 5, 10, 6],
+    [5, 10, 6, 1, 9, 2, 9, 11, 2, 9, 8, 11],
+    [6, 3, 11, 6, 5, 3, 5, 1, 3],
+    [0, 8, 11, 0, 11, 5, 0, 5, 1, 5, 11, 6],
+    [3, 11, 6, 0, 3, 6, 0, 6, 5, 0, 5, 9],
+    [6, 5, 9, 6, 9, 11, 11, 9, 8],
+    [5, 10, 6, 4, 7, 8],
+    [4, 3, 0, 4, 7, 3, 6, 5, 10],
+    [1, 9, 0, 5, 10, 6, 8, 4, 7],
+    [10, 6, 5, 1, 9, 7, 1, 7, 3, 7, 9, 4],
+    [6, 1, 2, 6, 5, 1, 4, 7, 8],
+    [1, 2, 5, 5, 2, 6, 3, 0, 4, 3, 4, 7],
+    [8, 4, 7, 9, 0, 5, 0, 6, 5, 0, 2, 6],
+    [7, 3, 9, 7, 9, 4, 3, 2, 9, 5, 9, 6, 2, 6, 9],
+    [3, 11, 2, 7, 8, 4, 10, 6, 5],
+    [5, 10, 6, 4, 7, 2, 4, 2, 0, 2, 7, 11],
+    [0, 1, 9, 4, 7, 8, 2, 3, 11, 5, 10, 6],
+    [9, 2, 1, 9, 11, 2, 9, 4, 11, 7, 11, 4, 5, 10, 6],
+    [8, 4, 7, 3, 11, 5, 3, 5, 1, 5, 11, 6],
+    [5, 1, 11, 5, 11, 6, 1, 0, 11, 7, 11, 4, 0, 4, 11],
+    [0, 5, 9, 0, 6, 5, 0, 3, 6, 11, 6, 3, 8, 4, 7],
+    [6, 5, 9, 6, 9, 11, 4, 7, 9, 7, 11, 9],
+    [10, 4, 9, 6, 4, 10],
+    [4, 10, 6, 4, 9, 10, 0, 8, 3],
+    [10, 0, 1, 10, 6, 0, 6, 4, 0],
+    [8, 3, 1, 8, 1, 6, 8, 6, 4, 6, 1, 10],
+    [1, 4, 9, 1, 2, 4, 2, 6, 4],
+    [3, 0, 8, 1, 2, 9, 2, 4, 9, 2, 6, 4],
+    [0, 2, 4, 4, 2, 6],
+    [8, 3, 2, 8, 2, 4, 4, 2, 6],
+    [10, 4, 9, 10, 6, 4, 11, 2, 3],
+    [0, 8, 2, 2, 8, 11, 4, 9, 10, 4, 10, 6],
+    [3, 11, 2, 0, 1, 6, 0, 6, 4, 6, 1, 10],
+    [6, 4, 1, 6, 1, 10, 4, 8, 1, 2, 1, 11, 8, 11, 1],
+    [9, 6, 4, 9, 3, 6, 9, 1, 3, 11, 6, 3],
+    [8, 11, 1, 8, 1, 0, 11, 6, 1, 9, 1, 4, 6, 4, 1],
+    [3, 11, 6, 3, 6, 0, 0, 6, 4],
+    [6, 4, 8, 11, 6, 8],
+    [7, 10, 6, 7, 8, 10, 8, 9, 10],
+    [0, 7, 3, 0, 10, 7, 0, 9, 10, 6, 7, 10],
+    [10, 6, 7, 1, 10, 7, 1, 7, 8, 1, 8, 0],
+    [10, 6, 7, 10, 7, 1, 1, 7, 3],
+    [1, 2, 6, 1, 6, 8, 1, 8, 9, 8, 6, 7],
+    [2, 6, 9, 2, 9, 1, 6, 7, 9, 0, 9, 3, 7, 3, 9],
+    [7, 8, 0, 7, 0, 6, 6, 0, 2],
+    [7, 3, 2, 6, 7, 2],
+    [2, 3, 11, 10, 6, 8, 10, 8, 9, 8, 6, 7],
+    [2, 0, 7, 2, 7, 11, 0, 9, 7, 6, 7, 10, 9, 10, 7],
+    [1, 8, 0, 1, 7, 8, 1, 10, 7, 6, 7, 10, 2, 3, 11],
+    [11, 2, 1, 11, 1, 7, 10, 6, 1, 6, 7, 1],
+    [8, 9, 6, 8, 6, 7, 9, 1, 6, 11, 6, 3, 1, 3, 6],
+    [0, 9, 1, 11, 6, 7],
+    [7, 8, 0, 7, 0, 6, 3, 11, 0, 11, 6, 0],
+    [7, 11, 6],
+    [7, 6, 11],   # Index 128: front top left corner of cube
+    [3, 0, 8, 11, 7, 6],
+    [0, 1, 9, 11, 7, 6],
+    [8, 1, 9, 8, 3, 1, 11, 7, 6],
+    [10, 1, 2, 6, 11, 7],
+    [1, 2, 10, 3, 0, 8, 6, 11, 7],
+    [2, 9, 0, 2, 10, 9, 6, 11, 7],
+    [6, 11, 7, 2, 10, 3, 10, 8, 3, 10, 9, 8],
+    [7, 2, 3, 6, 2, 7],
+    [7, 0, 8, 7, 6, 0, 6, 2, 0],
+    [2, 7, 6, 2, 3, 7, 0, 1, 9],
+    [1, 6, 2, 1, 8, 6, 1, 9, 8, 8, 7, 6],
+    [10, 7, 6, 10, 1, 7, 1, 3, 7],
+    [10, 7, 6, 1, 7, 10, 1, 8, 7, 1, 0, 8],
+    [0, 3, 7, 0, 7, 10, 0, 10, 9, 6, 10, 7],
+    [7, 6, 10, 7, 10, 8, 8, 10, 9],
+    [6, 8, 4, 11, 8, 6],
+    [3, 6, 11, 3, 0, 6, 0, 4, 6],
+    [8, 6, 11, 8, 4, 6, 9, 0, 1],
+    [9, 4, 6, 9, 6, 3, 9, 3, 1, 11, 3, 6],
+    [6, 8, 4, 6, 11, 8, 2, 10, 1],
+    [1, 2, 10, 3, 0, 11, 0, 6, 11, 0, 4, 6],
+    [4, 11, 8, 4, 6, 11, 0, 2, 9, 2, 10, 9],
+    [10, 9, 3, 10, 3, 2, 9, 4, 3, 11, 3, 6, 4, 6, 3],
+    [8, 2, 3, 8, 4, 2, 4, 6, 2],
+    [0, 4, 2, 4, 6, 2],
+    [1, 9, 0, 2, 3, 4, 2, 4, 6, 4, 3, 8],
+    [1, 9, 4, 1, 4, 2, 2, 4, 6],
+    [8, 1, 3, 8, 6, 1, 8, 4, 6, 6, 10, 1],
+    [10, 1, 0, 10, 0, 6, 6, 0, 4],
+    [4, 6, 3, 4, 3, 8, 6, 10, 3, 0, 3, 9, 10, 9, 3],
+    [10, 9, 4, 6, 10, 4],
+    [4, 9, 5, 7, 6, 11],
+    [0, 8, 3, 4, 9, 5, 11, 7, 6],
+    [5, 0, 1, 5, 4, 0, 7, 6, 11],
+    [11, 7, 6, 8, 3, 4, 3, 5, 4, 3, 1, 5],
+    [9, 5, 4, 10, 1, 2, 7, 6, 11],
+    [6, 11, 7, 1, 2, 10, 0, 8, 3, 4, 9, 5],
+    [7, 6, 11, 5, 4, 10, 4, 2, 10, 4, 0, 2],
+    [3, 4, 8, 3, 5, 4, 3, 2, 5, 10, 5, 2, 11, 7, 6],
+    [7, 2, 3, 7, 6, 2, 5, 4, 9],
+    [9, 5, 4, 0, 8, 6, 0, 6, 2, 6, 8, 7],
+    [3, 6, 2, 3, 7, 6, 1, 5, 0, 5, 4, 0],
+    [6, 2, 8, 6, 8, 7, 2, 1, 8, 4, 8, 5, 1, 5, 8],
+    [9, 5, 4, 10, 1, 6, 1, 7, 6, 1, 3, 7],
+    [1, 6, 10, 1, 7, 6, 1, 0, 7, 8, 7, 0, 9, 5, 4],
+    [4, 0, 10, 4, 10, 5, 0, 3, 10, 6, 10, 7, 3, 7, 10],
+    [7, 6, 10, 7, 10, 8, 5, 4, 10, 4, 8, 10],
+    [6, 9, 5, 6, 11, 9, 11, 8, 9],
+    [3, 6, 11, 0, 6, 3, 0, 5, 6, 0, 9, 5],
+    [0, 11, 8, 0, 5, 11, 0, 1, 5, 5, 6, 11],
+    [6, 11, 3, 6, 3, 5, 5, 3, 1],
+    [1, 2, 10, 9, 5, 11, 9, 11, 8, 11, 5, 6],
+    [0, 11, 3, 0, 6, 11, 0, 9, 6, 5, 6, 9, 1, 2, 10],
+    [11, 8, 5, 11, 5, 6, 8, 0, 5, 10, 5, 2, 0, 2, 5],
+    [6, 11, 3, 6, 3, 5, 2, 10, 3, 10, 5, 3],
+    [5, 8, 9, 5, 2, 8, 5, 6, 2, 3, 8, 2],
+    [9, 5, 6, 9, 6, 0, 0, 6, 2],
+    [1, 5, 8, 1, 8, 0, 5, 6, 8, 3, 8, 2, 6, 2, 8],
+    [1, 5, 6, 2, 1, 6],
+    [1, 3, 6, 1, 6, 10, 3, 8, 6, 5, 6, 9, 8, 9, 6],
+    [10, 1, 0, 10, 0, 6, 9, 5, 0, 5, 6, 0],
+    [0, 3, 8, 5, 6, 10],
+    [10, 5, 6],
+    [11, 5, 10, 7, 5, 11],
+    [11, 5, 10, 11, 7, 5, 8, 3, 0],
+    [5, 11, 7, 5, 10, 11, 1, 9, 0],
+    [10, 7, 5, 10, 11, 7, 9, 8, 1, 8, 3, 1],
+    [11, 1, 2, 11, 7, 1, 7, 5, 1],
+    [0, 8, 3, 1, 2, 7, 1, 7, 5, 7, 2, 11],
+    [9, 7, 5, 9, 2, 7, 9, 0, 2, 2, 11, 7],
+    [7, 5, 2, 7, 2, 11, 5, 9, 2, 3, 2, 8, 9, 8, 2],
+    [2, 5, 10, 2, 3, 5, 3, 7, 5],
+    [8, 2, 0, 8, 5, 2, 8, 7, 5, 10, 2, 5],
+    [9, 0, 1, 5, 10, 3, 5, 3, 7, 3, 10, 2],
+    [9, 8, 2, 9, 2, 1, 8, 7, 2, 10, 2, 5, 7, 5, 2],
+    [1, 3, 5, 3, 7, 5],
+    [0, 8, 7, 0, 7, 1, 1, 7, 5],
+    [9, 0, 3, 9, 3, 5, 5, 3, 7],
+    [9, 8, 7, 5, 9, 7],
+    [5, 8, 4, 5, 10, 8, 10, 11, 8],
+    [5, 0, 4, 5, 11, 0, 5, 10, 11, 11, 3, 0],
+    [0, 1, 9, 8, 4, 10, 8, 10, 11, 10, 4, 5],
+    [10, 11, 4, 10, 4, 5, 11, 3, 4, 9, 4, 1, 3, 1, 4],
+    [2, 5, 1, 2, 8, 5, 2, 11, 8, 4, 5, 8],
+    [0, 4, 11, 0, 11, 3, 4, 5, 11, 2, 11, 1, 5, 1, 11],
+    [0, 2, 5, 0, 5, 9, 2, 11, 5, 4, 5, 8, 11, 8, 5],
+    [9, 4, 5, 2, 11, 3],
+    [2, 5, 10, 3, 5, 2, 3, 4, 5, 3, 8, 4],
+    [5, 10, 2, 5, 2, 4, 4, 2, 0],
+    [3, 10, 2, 3, 5, 10, 3, 8, 5, 4, 5, 8, 0, 1, 9],
+    [5, 10, 2, 5, 2, 4, 1, 9, 2, 9, 4, 2],
+    [8, 4, 5, 8, 5, 3, 3, 5, 1],
+    [0, 4, 5, 1, 0, 5],
+    [8, 4, 5, 8, 5, 3, 9, 0, 5, 0, 3, 5],
+    [9, 4, 5],
+    [4, 11, 7, 4, 9, 11, 9, 10, 11],
+    [0, 8, 3, 4, 9, 7, 9, 11, 7, 9, 10, 11],
+    [1, 10, 11, 1, 11, 4, 1, 4, 0, 7, 4, 11],
+    [3, 1, 4, 3, 4, 8, 1, 10, 4, 7, 4, 11, 10, 11, 4],
+    [4, 11, 7, 9, 11, 4, 9, 2, 11, 9, 1, 2],
+    [9, 7, 4, 9, 11, 7, 9, 1, 11, 2, 11, 1, 0, 8, 3],
+    [11, 7, 4, 11, 4, 2, 2, 4, 0],
+    [11, 7, 4, 11, 4, 2, 8, 3, 4, 3, 2, 4],
+    [2, 9, 10, 2, 7, 9, 2, 3, 7, 7, 4, 9],
+    [9, 10, 7, 9, 7, 4, 10, 2, 7, 8, 7, 0, 2, 0, 7],
+    [3, 7, 10, 3, 10, 2, 7, 4, 10, 1, 10, 0, 4, 0, 10],
+    [1, 10, 2, 8, 7, 4],
+    [4, 9, 1, 4, 1, 7, 7, 1, 3],
+    [4, 9, 1, 4, 1, 7, 0, 8, 1, 8, 7, 1],
+    [4, 0, 3, 7, 4, 3],
+    [4, 8, 7],
+    [9, 10, 8, 10, 11, 8],
+    [3, 0, 9, 3, 9, 11, 11, 9, 10],
+    [0, 1, 10, 0, 10, 8, 8, 10, 11],
+    [3, 1, 10, 11, 3, 10],
+    [1, 2, 11, 1, 11, 9, 9, 11, 8],
+    [3, 0, 9, 3, 9, 11, 1, 2, 9, 2, 11, 9],
+    [0, 2, 11, 8, 0, 11],
+    [3, 2, 11],
+    [2, 3, 8, 2, 8, 10, 10, 8, 9],
+    [9, 10, 2, 0, 9, 2],
+    [2, 3, 8, 2, 8, 10, 0, 1, 8, 1, 10, 8],
+    [1, 10, 2],
+    [1, 3, 8, 9, 1, 8],
+    [0, 9, 1],
+    [0, 3, 8],
+    []
+]
+
+# Flattened form of the lookup table, built once at import time. All
+# configurations are concatenated into a single array of edge indices, with a
+# second array giving the offset where each case's configuration begins.
+# The edge indices are backed by an immutable bytes object, one byte per
+# index, which the array wraps without copying; the whole table stays small
+# enough to live in a few cache lines.
+_TRI_EDGES_BYTES = bytes(itertools.chain.from_iterable(_LOOKUP_TABLE))
+TRI_EDGES = np.frombuffer(_TRI_EDGES_BYTES, dtype=np.uint8)
+TRI_OFFSETS = np.cumsum([0] + [len(configuration) for configuration in _LOOKUP_TABLE], dtype=np.int32)
+
+# Relative position on the cube of each of its 8 corners. Corner k corresponds
+# to bit k of the case bitmask.
+CORNER_OFFSETS = np.array([
+    (0, 0, 0),  # Back bottom left
+    (1, 0, 0),  # Back bottom right
+    (1, 0, 1),  # Front bottom right
+    (0, 0, 1),  # Front bottom left
+    (0, 1, 0),  # Back top left
+    (1, 1, 0),  # Back top right
+    (1, 1, 1),  # Front top right
+    (0, 1, 1)   # Front top left
+], dtype=np.int8)
+
+# Corner indices of the two endpoints of each of the cube's 12 edges
+EDGE_ENDPOINTS = np.array([
+    (0, 1),
+    (1, 2),
+    (2, 3),
+    (3, 0),
+    (4, 5),
+    (5, 6),
+    (6, 7),
+    (7, 4),
+    (0, 4),
+    (1, 5),
+    (2, 6),
+    (3, 7)
+], dtype=np.int8)
+
+
 # Helper functions used in the marching cubes algorithm
+def _device_tables(array):
+    """ Get the marching cubes lookup tables on the same device as an array.
+
+    Parameters
+    ----------
+    array : np.ndarray or cupy.ndarray
+        Array whose device the tables are needed on
+
+    Returns
+    -------
+    tri_edges, tri_offsets, corner_offsets, edge_endpoints : np.ndarray or cupy.ndarray
+        The module's lookup tables, copied to the GPU (once, then cached) if
+        the array lives there
+
+    """
+
+    global _GPU_TABLES
+
+    if cupy is not None and isinstance(array, cupy.ndarray):
+        if _GPU_TABLES is None:
+            _GPU_TABLES = tuple(cupy.asarray(table) for table in
+                                (TRI_EDGES, TRI_OFFSETS, CORNER_OFFSETS, EDGE_ENDPOINTS))
+        return _GPU_TABLES
+
+    return TRI_EDGES, TRI_OFFSETS, CORNER_OFFSETS, EDGE_ENDPOINTS
+
+_GPU_TABLES = None  # Lookup tables copied to the GPU, created on first use
+
+
+def _ensure_vectorized(scalar_field):
+    """ Wraps a scalar field so it can be evaluated on whole coordinate arrays.
+
+    Fields built from NumPy operations (as both provided fields are) pass
+    through untouched and are evaluated one array at a time. Fields that can
+    only handle one point at a time are wrapped with np.vectorize, which keeps
+    them working but still pays a Python call per grid point; for such fields
+    marching_cubes_jit is the faster route.
+
+    Parameters
+    ----------
+    scalar_field : function
+        Scalar field f(x, y, z), accepting either arrays or scalars
+
+    Returns
+    -------
+    scalar_field : function
+        The field itself if it already handles arrays, otherwise a vectorized
+        wrapper around it
+
+    """
+
+    try:  # Probe the field with a small coordinate array
+        probe = np.linspace(0.25, 1.0, 4).reshape(2, 2)
+        if np.shape(scalar_field(probe, probe, probe)) == probe.shape:
+            return scalar_field
+    except Exception:
+        pass  # Field rejected array input; fall through to the wrapper
+
+    return np.vectorize(scalar_field)
+
+
+def _active_blocks(scalar_field, isovalue, corner_coords, block_bounds):
+    """ Coarse pre-scan marking which blocks of cubes could cross the object's
+    boundary. The scalar field is sampled only at block corners; a block is
+    rejected when its corners all lie on the same side of the isovalue by a
+    margin larger than the field can change across the block, using a slope
+    bound estimated from the coarse samples themselves.
+
+    The estimate is reliable for smooth fields but is not a strict guarantee:
+    a field oscillating faster than the block spacing can be sampled may have
+    crossings inside a rejected block.
+
+    Parameters
+    ----------
+    scalar_field : function
+        Scalar field f(x, y, z) defining the object
+    isovalue : float
+        Boundary value used to define which points are considered to be inside
+        of the object
+    corner_coords : np.ndarray
+        Coordinate values of the fine grid of cube corners, along one axis
+    block_bounds : np.ndarray
+        Fine-grid indices of the block boundaries, along one axis
+
+    Returns
+    -------
+    block_active : np.ndarray
+        Boolean array with one entry per block, False where the block cannot
+        cross the boundary and its cubes can be skipped
+
+    """
+
+    # Sample the scalar field at every block corner
+    coarse_coords = np.asarray(corner_coords)[np.asarray(block_bounds)]
+    X, Y, Z = np.meshgrid(coarse_coords, coarse_coords, coarse_coords, indexing='ij')
+    coarse_values = np.asarray(scalar_field(X, Y, Z)) - isovalue
+
+    # Estimate a bound on the field's slope from the coarse samples. The
+    # factor of 2 guards against slopes the coarse sampling underestimates.
+    slope_bound = 2 * max(np.abs(gradient).max() for gradient in
+                          np.gradient(coarse_values, coarse_coords, coarse_coords, coarse_coords))
+
+    # Furthest distance between any two points within a block
+    block_extent = coarse_coords[1:] - coarse_coords[:-1]
+    block_diagonal = np.sqrt(3) * block_extent.max()
+
+    # Gather the 8 corner values of every block, as for the case bitmask
+    corners = np.stack([coarse_values[i:, j:, k:][:len(block_extent), :len(block_extent), :len(block_extent)]
+                        for i in (0, 1) for j in (0, 1) for k in (0, 1)])
+
+    # A block is rejected only when all corners lie on the same side of the
+    # boundary and the field cannot change enough inside it to cross
+    uniform = (corners < 0).all(axis=0) | (corners >= 0).all(axis=0)
+    margin = np.abs(corners).min(axis=0)
+
+    block_active = ~uniform | (margin <= slope_bound * block_diagonal)
+
+    return block_active
+
+
+@functools.lru_cache(maxsize=256)
 def _lookup_configuration(case):
-    """ Lookup which of the cube's edge midpoints define the vertices of the
-    triangle(s) in a case of marching cubes.
-    
+    """ Lookup which of the cube's edges define the vertices of the
+    triangle(s) in a case of marching cubes. There are only 256 cases, so
+    every possible result is cached after its first lookup.
+
     Parameters
     ----------
     case : int
@@ -32,335 +470,108 @@ def _lookup_configuration(case):
 
     Returns
     -------
-    configuration : list[int]
-        Edge indices corresponding to the given case of marching cubes
-    
+    configuration : memoryview
+        Edge indices corresponding to the given case of marching cubes, as a
+        zero-copy view into the table, one byte per index
+
     """
 
-    # Define lookup table. Each index of the table corresponds to one case of
-    # marching cubes. Each list element corresponds to one edge of the cube.
-    lookup_table = [
-        [],
-        [0, 8, 3],    # Index 1: back bottom left corner of cube
-        [0, 1, 9],    # Index 2: back bottom right corner of cube 
-        [1, 8, 3, 9, 8, 1],
-        [1, 2, 10],   # Index 4: front bottom right corner of cube
-        [0, 8, 3, 1, 2, 10],
-        [9, 2, 10, 0, 2, 9],
-        [2, 8, 3, 2, 10, 8, 10, 9, 8],
-        [3, 11, 2],   # Index 8: front bottom left corner of cube
-        [0, 11, 2, 8, 11, 0],
-        [1, 9, 0, 2, 3, 11],
-        [1, 11, 2, 1, 9, 11, 9, 8, 11],
-        [3, 10, 1, 11, 10, 3],
-        [0, 10, 1, 0, 8, 10, 8, 11, 10],
-        [3, 9, 0, 3, 11, 9, 11, 10, 9],
-        [9, 8, 10, 10, 8, 11],
-        [4, 7, 8],   # Index 16: bottom top left corner of cube
-        [4, 3, 0, 7, 3, 4],
-        [0, 1, 9, 8, 4, 7],
-        [4, 1, 9, 4, 7, 1, 7, 3, 1],
-        [1, 2, 10, 8, 4, 7],
-        [3, 4, 7, 3, 0, 4, 1, 2, 10],
-        [9, 2, 10, 9, 0, 2, 8, 4, 7],
-        [2, 10, 9, 2, 9, 7, 2, 7, 3, 7, 9, 4],
-        [8, 4, 7, 3, 11, 2],
-        [11, 4, 7, 11, 2, 4, 2, 0, 4],
-        [9, 0, 1, 8, 4, 7, 2, 3, 11],
-        [4, 7, 11, 9, 4, 11, 9, 11, 2, 9, 2, 1],
-        [3, 10, 1, 3, 11, 10, 7, 8, 4],
-        [1, 11, 10, 1, 4, 11, 1, 0, 4, 7, 11, 4],
-        [4, 7, 8, 9, 0, 11, 9, 11, 10, 11, 0, 3],
-        [4, 7, 11, 4, 11, 9, 9, 11, 10],
-        [9, 5, 4],   # Index 32: bottom top right corner of cube
-        [9, 5, 4, 0, 8, 3],
-        [0, 5, 4, 1, 5, 0],
-        [8, 5, 4, 8, 3, 5, 3, 1, 5],
-        [1, 2, 10, 9, 5, 4],
-        [3, 0, 8, 1, 2, 10, 4, 9, 5],
-        [5, 2, 10, 5, 4, 2, 4, 0, 2],
-        [2, 10, 5, 3, 2, 5, 3, 5, 4, 3, 4, 8],
-        [9, 5, 4, 2, 3, 11],
-        [0, 11, 2, 0, 8, 11, 4, 9, 5],
-        [0, 5, 4, 0, 1, 5, 2, 3, 11],
-        [2, 1, 5, 2, 5, 8, 2, 8, 11, 4, 8, 5],
-        [10, 3, 11, 10, 1, 3, 9, 5, 4],
-        [4, 9, 5, 0, 8, 1, 8, 10, 1, 8, 11, 10],
-        [5, 4, 0, 5, 0, 11, 5, 11, 10, 11, 0, 3],
-        [5, 4, 8, 5, 8, 10, 10, 8, 11],
-        [9, 7, 8, 5, 7, 9],
-        [9, 3, 0, 9, 5, 3, 5, 7, 3],
-        [0, 7, 8, 0, 1, 7, 1, 5, 7],
-        [1, 5, 3, 3, 5, 7],
-        [9, 7, 8, 9, 5, 7, 10, 1, 2],
-        [10, 1, 2, 9, 5, 0, 5, 3, 0, 5, 7, 3],
-        [8, 0, 2, 8, 2, 5, 8, 5, 7, 10, 5, 2],
-        [2, 10, 5, 2, 5, 3, 3, 5, 7],
-        [7, 9, 5, 7, 8, 9, 3, 11, 2],
-        [9, 5, 7, 9, 7, 2, 9, 2, 0, 2, 7, 11],
-        [2, 3, 11, 0, 1, 8, 1, 7, 8, 1, 5, 7],
-        [11, 2, 1, 11, 1, 7, 7, 1, 5],
-        [9, 5, 8, 8, 5, 7, 10, 1, 3, 10, 3, 11],
-        [5, 7, 0, 5, 0, 9, 7, 11, 0, 1, 0, 10, 11, 10, 0],
-        [11, 10, 0, 11, 0, 3, 10, 5, 0, 8, 0, 7, 5, 7, 0],
-        [11, 10, 5, 7, 11, 5],
-        [10, 6, 5],   # Index 64: front top right corner of cube
-        [0, 8, 3, 5, 10, 6],
-        [9, 0, 1, 5, 10, 6],
-        [1, 8, 3, 1, 9, 8, 5, 10, 6],
-        [1, 6, 5, 2, 6, 1],
-        [1, 6, 5, 1, 2, 6, 3, 0, 8],
-        [9, 6, 5, 9, 0, 6, 0, 2, 6],
-        [5, 9, 8, 5, 8, 2, 5, 2, 6, 3, 2, 8],
-        [2, 3, 11, 10, 6, 5],
-        [11, 0, 8, 11, 2, 0, 10, 6, 5],
-        [0, 1, 9, 2, 3, 11, 5, 10, 6],
-        [5, 10, 6, 1, 9, 2, 9, 11, 2, 9, 8, 11],
-        [6, 3, 11, 6, 5, 3, 5, 1, 3],
-        [0, 8, 11, 0, 11, 5, 0, 5, 1, 5, 11, 6],
-        [3, 11, 6, 0, 3, 6, 0, 6, 5, 0, 5, 9],
-        [6, 5, 9, 6, 9, 11, 11, 9, 8],
-        [5, 10, 6, 4, 7, 8],
-        [4, 3, 0, 4, 7, 3, 6, 5, 10],
-        [1, 9, 0, 5, 10, 6, 8, 4, 7],
-        [10, 6, 5, 1, 9, 7, 1, 7, 3, 7, 9, 4],
-        [6, 1, 2, 6, 5, 1, 4, 7, 8],
-        [1, 2, 5, 5, 2, 6, 3, 0, 4, 3, 4, 7],
-        [8, 4, 7, 9, 0, 5, 0, 6, 5, 0, 2, 6],
-        [7, 3, 9, 7, 9, 4, 3, 2, 9, 5, 9, 6, 2, 6, 9],
-        [3, 11, 2, 7, 8, 4, 10, 6, 5],
-        [5, 10, 6, 4, 7, 2, 4, 2, 0, 2, 7, 11],
-        [0, 1, 9, 4, 7, 8, 2, 3, 11, 5, 10, 6],
-        [9, 2, 1, 9, 11, 2, 9, 4, 11, 7, 11, 4, 5, 10, 6],
-        [8, 4, 7, 3, 11, 5, 3, 5, 1, 5, 11, 6],
-        [5, 1, 11, 5, 11, 6, 1, 0, 11, 7, 11, 4, 0, 4, 11],
-        [0, 5, 9, 0, 6, 5, 0, 3, 6, 11, 6, 3, 8, 4, 7],
-        [6, 5, 9, 6, 9, 11, 4, 7, 9, 7, 11, 9],
-        [10, 4, 9, 6, 4, 10],
-        [4, 10, 6, 4, 9, 10, 0, 8, 3],
-        [10, 0, 1, 10, 6, 0, 6, 4, 0],
-        [8, 3, 1, 8, 1, 6, 8, 6, 4, 6, 1, 10],
-        [1, 4, 9, 1, 2, 4, 2, 6, 4],
-        [3, 0, 8, 1, 2, 9, 2, 4, 9, 2, 6, 4],
-        [0, 2, 4, 4, 2, 6],
-        [8, 3, 2, 8, 2, 4, 4, 2, 6],
-        [10, 4, 9, 10, 6, 4, 11, 2, 3],
-        [0, 8, 2, 2, 8, 11, 4, 9, 10, 4, 10, 6],
-        [3, 11, 2, 0, 1, 6, 0, 6, 4, 6, 1, 10],
-        [6, 4, 1, 6, 1, 10, 4, 8, 1, 2, 1, 11, 8, 11, 1],
-        [9, 6, 4, 9, 3, 6, 9, 1, 3, 11, 6, 3],
-        [8, 11, 1, 8, 1, 0, 11, 6, 1, 9, 1, 4, 6, 4, 1],
-        [3, 11, 6, 3, 6, 0, 0, 6, 4],
-        [6, 4, 8, 11, 6, 8],
-        [7, 10, 6, 7, 8, 10, 8, 9, 10],
-        [0, 7, 3, 0, 10, 7, 0, 9, 10, 6, 7, 10],
-        [10, 6, 7, 1, 10, 7, 1, 7, 8, 1, 8, 0],
-        [10, 6, 7, 10, 7, 1, 1, 7, 3],
-        [1, 2, 6, 1, 6, 8, 1, 8, 9, 8, 6, 7],
-        [2, 6, 9, 2, 9, 1, 6, 7, 9, 0, 9, 3, 7, 3, 9],
-        [7, 8, 0, 7, 0, 6, 6, 0, 2],
-        [7, 3, 2, 6, 7, 2],
-        [2, 3, 11, 10, 6, 8, 10, 8, 9, 8, 6, 7],
-        [2, 0, 7, 2, 7, 11, 0, 9, 7, 6, 7, 10, 9, 10, 7],
-        [1, 8, 0, 1, 7, 8, 1, 10, 7, 6, 7, 10, 2, 3, 11],
-        [11, 2, 1, 11, 1, 7, 10, 6, 1, 6, 7, 1],
-        [8, 9, 6, 8, 6, 7, 9, 1, 6, 11, 6, 3, 1, 3, 6],
-        [0, 9, 1, 11, 6, 7],
-        [7, 8, 0, 7, 0, 6, 3, 11, 0, 11, 6, 0],
-        [7, 11, 6],
-        [7, 6, 11],   # Index 128: front top left corner of cube
-        [3, 0, 8, 11, 7, 6],
-        [0, 1, 9, 11, 7, 6],
-        [8, 1, 9, 8, 3, 1, 11, 7, 6],
-        [10, 1, 2, 6, 11, 7],
-        [1, 2, 10, 3, 0, 8, 6, 11, 7],
-        [2, 9, 0, 2, 10, 9, 6, 11, 7],
-        [6, 11, 7, 2, 10, 3, 10, 8, 3, 10, 9, 8],
-        [7, 2, 3, 6, 2, 7],
-        [7, 0, 8, 7, 6, 0, 6, 2, 0],
-        [2, 7, 6, 2, 3, 7, 0, 1, 9],
-        [1, 6, 2, 1, 8, 6, 1, 9, 8, 8, 7, 6],
-        [10, 7, 6, 10, 1, 7, 1, 3, 7],
-        [10, 7, 6, 1, 7, 10, 1, 8, 7, 1, 0, 8],
-        [0, 3, 7, 0, 7, 10, 0, 10, 9, 6, 10, 7],
-        [7, 6, 10, 7, 10, 8, 8, 10, 9],
-        [6, 8, 4, 11, 8, 6],
-        [3, 6, 11, 3, 0, 6, 0, 4, 6],
-        [8, 6, 11, 8, 4, 6, 9, 0, 1],
-        [9, 4, 6, 9, 6, 3, 9, 3, 1, 11, 3, 6],
-        [6, 8, 4, 6, 11, 8, 2, 10, 1],
-        [1, 2, 10, 3, 0, 11, 0, 6, 11, 0, 4, 6],
-        [4, 11, 8, 4, 6, 11, 0, 2, 9, 2, 10, 9],
-        [10, 9, 3, 10, 3, 2, 9, 4, 3, 11, 3, 6, 4, 6, 3],
-        [8, 2, 3, 8, 4, 2, 4, 6, 2],
-        [0, 4, 2, 4, 6, 2],
-        [1, 9, 0, 2, 3, 4, 2, 4, 6, 4, 3, 8],
-        [1, 9, 4, 1, 4, 2, 2, 4, 6],
-        [8, 1, 3, 8, 6, 1, 8, 4, 6, 6, 10, 1],
-        [10, 1, 0, 10, 0, 6, 6, 0, 4],
-        [4, 6, 3, 4, 3, 8, 6, 10, 3, 0, 3, 9, 10, 9, 3],
-        [10, 9, 4, 6, 10, 4],
-        [4, 9, 5, 7, 6, 11],
-        [0, 8, 3, 4, 9, 5, 11, 7, 6],
-        [5, 0, 1, 5, 4, 0, 7, 6, 11],
-        [11, 7, 6, 8, 3, 4, 3, 5, 4, 3, 1, 5],
-        [9, 5, 4, 10, 1, 2, 7, 6, 11],
-        [6, 11, 7, 1, 2, 10, 0, 8, 3, 4, 9, 5],
-        [7, 6, 11, 5, 4, 10, 4, 2, 10, 4, 0, 2],
-        [3, 4, 8, 3, 5, 4, 3, 2, 5, 10, 5, 2, 11, 7, 6],
-        [7, 2, 3, 7, 6, 2, 5, 4, 9],
-        [9, 5, 4, 0, 8, 6, 0, 6, 2, 6, 8, 7],
-        [3, 6, 2, 3, 7, 6, 1, 5, 0, 5, 4, 0],
-        [6, 2, 8, 6, 8, 7, 2, 1, 8, 4, 8, 5, 1, 5, 8],
-        [9, 5, 4, 10, 1, 6, 1, 7, 6, 1, 3, 7],
-        [1, 6, 10, 1, 7, 6, 1, 0, 7, 8, 7, 0, 9, 5, 4],
-        [4, 0, 10, 4, 10, 5, 0, 3, 10, 6, 10, 7, 3, 7, 10],
-        [7, 6, 10, 7, 10, 8, 5, 4, 10, 4, 8, 10],
-        [6, 9, 5, 6, 11, 9, 11, 8, 9],
-        [3, 6, 11, 0, 6, 3, 0, 5, 6, 0, 9, 5],
-        [0, 11, 8, 0, 5, 11, 0, 1, 5, 5, 6, 11],
-        [6, 11, 3, 6, 3, 5, 5, 3, 1],
-        [1, 2, 10, 9, 5, 11, 9, 11, 8, 11, 5, 6],
-        [0, 11, 3, 0, 6, 11, 0, 9, 6, 5, 6, 9, 1, 2, 10],
-        [11, 8, 5, 11, 5, 6, 8, 0, 5, 10, 5, 2, 0, 2, 5],
-        [6, 11, 3, 6, 3, 5, 2, 10, 3, 10, 5, 3],
-        [5, 8, 9, 5, 2, 8, 5, 6, 2, 3, 8, 2],
-        [9, 5, 6, 9, 6, 0, 0, 6, 2],
-        [1, 5, 8, 1, 8, 0, 5, 6, 8, 3, 8, 2, 6, 2, 8],
-        [1, 5, 6, 2, 1, 6],
-        [1, 3, 6, 1, 6, 10, 3, 8, 6, 5, 6, 9, 8, 9, 6],
-        [10, 1, 0, 10, 0, 6, 9, 5, 0, 5, 6, 0],
-        [0, 3, 8, 5, 6, 10],
-        [10, 5, 6],
-        [11, 5, 10, 7, 5, 11],
-        [11, 5, 10, 11, 7, 5, 8, 3, 0],
-        [5, 11, 7, 5, 10, 11, 1, 9, 0],
-        [10, 7, 5, 10, 11, 7, 9, 8, 1, 8, 3, 1],
-        [11, 1, 2, 11, 7, 1, 7, 5, 1],
-        [0, 8, 3, 1, 2, 7, 1, 7, 5, 7, 2, 11],
-        [9, 7, 5, 9, 2, 7, 9, 0, 2, 2, 11, 7],
-        [7, 5, 2, 7, 2, 11, 5, 9, 2, 3, 2, 8, 9, 8, 2],
-        [2, 5, 10, 2, 3, 5, 3, 7, 5],
-        [8, 2, 0, 8, 5, 2, 8, 7, 5, 10, 2, 5],
-        [9, 0, 1, 5, 10, 3, 5, 3, 7, 3, 10, 2],
-        [9, 8, 2, 9, 2, 1, 8, 7, 2, 10, 2, 5, 7, 5, 2],
-        [1, 3, 5, 3, 7, 5],
-        [0, 8, 7, 0, 7, 1, 1, 7, 5],
-        [9, 0, 3, 9, 3, 5, 5, 3, 7],
-        [9, 8, 7, 5, 9, 7],
-        [5, 8, 4, 5, 10, 8, 10, 11, 8],
-        [5, 0, 4, 5, 11, 0, 5, 10, 11, 11, 3, 0],
-        [0, 1, 9, 8, 4, 10, 8, 10, 11, 10, 4, 5],
-        [10, 11, 4, 10, 4, 5, 11, 3, 4, 9, 4, 1, 3, 1, 4],
-        [2, 5, 1, 2, 8, 5, 2, 11, 8, 4, 5, 8],
-        [0, 4, 11, 0, 11, 3, 4, 5, 11, 2, 11, 1, 5, 1, 11],
-        [0, 2, 5, 0, 5, 9, 2, 11, 5, 4, 5, 8, 11, 8, 5],
-        [9, 4, 5, 2, 11, 3],
-        [2, 5, 10, 3, 5, 2, 3, 4, 5, 3, 8, 4],
-        [5, 10, 2, 5, 2, 4, 4, 2, 0],
-        [3, 10, 2, 3, 5, 10, 3, 8, 5, 4, 5, 8, 0, 1, 9],
-        [5, 10, 2, 5, 2, 4, 1, 9, 2, 9, 4, 2],
-        [8, 4, 5, 8, 5, 3, 3, 5, 1],
-        [0, 4, 5, 1, 0, 5],
-        [8, 4, 5, 8, 5, 3, 9, 0, 5, 0, 3, 5],
-        [9, 4, 5],
-        [4, 11, 7, 4, 9, 11, 9, 10, 11],
-        [0, 8, 3, 4, 9, 7, 9, 11, 7, 9, 10, 11],
-        [1, 10, 11, 1, 11, 4, 1, 4, 0, 7, 4, 11],
-        [3, 1, 4, 3, 4, 8, 1, 10, 4, 7, 4, 11, 10, 11, 4],
-        [4, 11, 7, 9, 11, 4, 9, 2, 11, 9, 1, 2],
-        [9, 7, 4, 9, 11, 7, 9, 1, 11, 2, 11, 1, 0, 8, 3],
-        [11, 7, 4, 11, 4, 2, 2, 4, 0],
-        [11, 7, 4, 11, 4, 2, 8, 3, 4, 3, 2, 4],
-        [2, 9, 10, 2, 7, 9, 2, 3, 7, 7, 4, 9],
-        [9, 10, 7, 9, 7, 4, 10, 2, 7, 8, 7, 0, 2, 0, 7],
-        [3, 7, 10, 3, 10, 2, 7, 4, 10, 1, 10, 0, 4, 0, 10],
-        [1, 10, 2, 8, 7, 4],
-        [4, 9, 1, 4, 1, 7, 7, 1, 3],
-        [4, 9, 1, 4, 1, 7, 0, 8, 1, 8, 7, 1],
-        [4, 0, 3, 7, 4, 3],
-        [4, 8, 7],
-        [9, 10, 8, 10, 11, 8],
-        [3, 0, 9, 3, 9, 11, 11, 9, 10],
-        [0, 1, 10, 0, 10, 8, 8, 10, 11],
-        [3, 1, 10, 11, 3, 10],
-        [1, 2, 11, 1, 11, 9, 9, 11, 8],
-        [3, 0, 9, 3, 9, 11, 1, 2, 9, 2, 11, 9],
-        [0, 2, 11, 8, 0, 11],
-        [3, 2, 11],
-        [2, 3, 8, 2, 8, 10, 10, 8, 9],
-        [9, 10, 2, 0, 9, 2],
-        [2, 3, 8, 2, 8, 10, 0, 1, 8, 1, 10, 8],
-        [1, 10, 2],
-        [1, 3, 8, 9, 1, 8],
-        [0, 9, 1],
-        [0, 3, 8],
-        []
-    ]
-
-    configuration = lookup_table[case]
+    configuration = memoryview(_TRI_EDGES_BYTES)[TRI_OFFSETS[case]:TRI_OFFSETS[case + 1]]
 
     return configuration
 
 
-def _get_vertex_positions(configuration, coordinate, stepsize):
-    """ Get the vertex positions corresponding to a list of edge indices.
-    
+def _get_vertex_positions(cases, active_cubes, corner_coords, field_pair, slab_index, isovalue):
+    """ Get the vertex positions for every active cube in a slab at once. Each
+    vertex is placed where the scalar field crosses the isovalue along its
+    edge, found by linear interpolation between the field values at the edge's
+    endpoints.
+
     Parameters
     ----------
-    configuration : list[int]
-        List of edge indices
-    coordinate : tuple(float, float, float)
-        Bottom-left corner of cube
-    stepsize : float
-        Size length of cube
+    cases : np.ndarray
+        Case of marching cubes for each active cube in the slab
+    active_cubes : np.ndarray
+        Grid index (x, z) of each active cube in the slab, as an array of
+        shape (N, 2)
+    corner_coords : np.ndarray
+        Coordinate values of the grid of cube corners, along one axis
+    field_pair : np.ndarray
+        Scalar field sampled on the two planes of cube corners bounding the
+        slab, as an array of shape (2, grid size, grid size)
+    slab_index : int
+        Index of the slab along the y axis
+    isovalue : float
+        Boundary value used to define which points are considered to be inside
+        of the object
 
     Returns
     -------
-    configuration_vertices : list[int]
-        List of triangle vertex coordinates
+    configuration_vertices : np.ndarray
+        Triangle vertex coordinates, as an array of shape (M, 3)
 
     """
 
-    x, y, z = coordinate  # Unpack coordinates
-
-    # Relative position on the cube of each edge's midpoint
-    edge_midpoints = [
-        (0.5, 0.0, 0.0),
-        (1.0, 0.0, 0.5),
-        (0.5, 0.0, 1.0),
-        (0.0, 0.0, 0.5),
-        (0.5, 1.0, 0.0),
-        (1.0, 1.0, 0.5),
-        (0.5, 1.0, 1.0),
-        (0.0, 1.0, 0.5),
-        (0.0, 0.5, 0.0),
-        (1.0, 0.5, 0.0),
-        (1.0, 0.5, 1.0),
-        (0.0, 0.5, 1.0)
-    ]
-
-    # Calculate vertex coordinate for each edge index in the configuration
-    configuration_vertices = []
-    for index in configuration:
-
-        edge_x, edge_y, edge_z = edge_midpoints[index]
-
-        configuration_vertices.append(x + stepsize * edge_x)
-        configuration_vertices.append(y + stepsize * edge_y)
-        configuration_vertices.append(z + stepsize * edge_z)
+    # Work with whichever array module (NumPy or CuPy) the slab lives on, and
+    # fetch the lookup tables on the same device
+    xp = cupy.get_array_module(cases) if cupy is not None else np
+    tri_edges, tri_offsets, corner_offsets, edge_endpoints = _device_tables(cases)
+
+    # Gather each cube's configuration from the flattened lookup table. Each
+    # cube contributes a variable number of edge indices, so the gather is
+    # built by repeating each cube's start offset once per edge index.
+    starts = tri_offsets[cases]
+    counts = tri_offsets[cases + 1] - starts
+    total = int(counts.sum())
+
+    flat_indices = xp.repeat(starts, counts) + xp.arange(total) - xp.repeat(xp.cumsum(counts) - counts, counts)
+    edges = tri_edges[flat_indices]
+
+    # Offset on the cube of both endpoints of each vertex's edge. The y
+    # component selects which of the slab's two planes the endpoint lies on.
+    corner_a = corner_offsets[edge_endpoints[edges, 0]]
+    corner_b = corner_offsets[edge_endpoints[edges, 1]]
+
+    # Grid index of the endpoints within each plane
+    cube_indices = xp.repeat(active_cubes, counts, axis=0)
+    index_a = cube_indices + xp.stack((corner_a[:, 0], corner_a[:, 2]), axis=1)
+    index_b = cube_indices + xp.stack((corner_b[:, 0], corner_b[:, 2]), axis=1)
+
+    # Scalar field values at the edge endpoints. The endpoints of a crossed
+    # edge always straddle the isovalue, so the denominator is never zero.
+    field_a = field_pair[corner_a[:, 1], index_a[:, 0], index_a[:, 1]]
+    field_b = field_pair[corner_b[:, 1], index_b[:, 0], index_b[:, 1]]
+    interpolant = (isovalue - field_a) / (field_b - field_a)
+
+    # Interpolate each vertex position between the endpoint coordinates
+    slab_y = corner_coords[slab_index:slab_index + 2]  # y coordinate of the slab's two planes
+
+    position_a = xp.stack((corner_coords[index_a[:, 0]], slab_y[corner_a[:, 1]], corner_coords[index_a[:, 1]]), axis=1)
+    position_b = xp.stack((corner_coords[index_b[:, 0]], slab_y[corner_b[:, 1]], corner_coords[index_b[:, 1]]), axis=1)
+    configuration_vertices = position_a + interpolant[:, np.newaxis] * (position_b - position_a)
 
     return configuration_vertices
 
 
 # Main functions
-def marching_cubes(scalar_field, isovalue, volume_min, volume_max, stepsize):
-    """ Generates a triangle mesh of an object from a scalar field using marching cubes.
-    
+def marching_cubes_slabs(scalar_field, isovalue, volume_min, volume_max, stepsize, use_gpu=False, coarse_stride=None):
+    """ Generates a triangle mesh of an object from a scalar field using
+    marching cubes, yielding the vertices one slab of cubes at a time.
+
+    Generator form of marching_cubes. Only the slab being marched is ever
+    held in memory, so a consumer that writes each slab straight to disk
+    (see writePLY_stream) can mesh volumes whose full vertex list would not
+    fit in memory.
+
     Parameters
     ----------
     scalar_field : function
-        Scalar field f(x, y, z) defining the object to generate a triangle mesh of
+        Scalar field f(x, y, z) defining the object to generate a triangle
+        mesh of. The field is evaluated on whole coordinate arrays at once,
+        so it should be built from NumPy operations (as both provided fields
+        are). Fields that only handle one point at a time are wrapped with
+        np.vectorize automatically, at a large speed cost; marching_cubes_jit
+        is the faster route for such fields.
     isovalue : float
         Boundary value used to define which points are considered to be inside
         of the object. If f(x, y, z) < isovalue, then the point (x, y, z) is
@@ -372,19 +583,31 @@ def marching_cubes(scalar_field, isovalue, volume_min, volume_max, stepsize):
         Maximum value of x, y, and z to use in the algorithm.
     stepsize : float
         Side length of each cube in the algorithm.
+    use_gpu : bool
+        Run the sweep on the GPU with CuPy. Every step of the algorithm is a
+        whole-array operation, so on large volumes the GPU path can be orders
+        of magnitude faster. Requires CuPy and a CUDA device, and a scalar
+        field built from array operations (as both provided fields are).
+    coarse_stride : int
+        Skip blocks of coarse_stride^3 cubes that a coarse pre-scan of the
+        scalar field shows cannot cross the object's boundary. Large volumes
+        are mostly deep inside or outside the object, so for smooth fields
+        this avoids most of the fine-grained work. The pre-scan bounds the
+        field's slope from its own coarse samples, so it may miss crossings
+        in fields that oscillate faster than the block spacing.
 
-    Returns
-    -------
-    mesh_vertices : list[float]
-        Vertices in the triangle mesh for the object generated by the algorithm
-    
-    """
+    Yields
+    ------
+    slab_vertices : np.ndarray
+        Triangle vertices generated in one slab of cubes, as a float32 array
+        of shape (k, 3). Every vertex count is a multiple of 3, so slabs can
+        be split into triangles independently.
 
-    mesh_vertices = []  # Vertices in the triangle mesh for the object generated by the algorithm
+    """
 
-    # Indices in the lookup table corresponding each cube corner. 
+    # Indices in the lookup table corresponding each cube corner.
     # Used to build the bitmask for each case of marching cubes
-    FRONT_BOTTOM_LEFT = 8  
+    FRONT_BOTTOM_LEFT = 8
     FRONT_BOTTOM_RIGHT = 4
     FRONT_TOP_LEFT = 128
     FRONT_TOP_RIGHT = 64
@@ -394,37 +617,316 @@ def marching_cubes(scalar_field, isovalue, volume_min, volume_max, stepsize):
     BACK_TOP_LEFT = 16
     BACK_TOP_RIGHT = 32
 
-    # Divide the volume into cubes
-    for y in np.arange(volume_min, volume_max, stepsize):
-        for x in np.arange(volume_min, volume_max, stepsize):
-            for z in np.arange(volume_min, volume_max, stepsize):
-
-                # Test if each of the 8 corners of the cube fall inside or
-                # outside of the object, and build up bitmask
-                case = 0
-                if (scalar_field(x, y, z) < isovalue):
-                    case |= BACK_BOTTOM_LEFT
-                if (scalar_field(x+stepsize, y, z) < isovalue):
-                    case |= BACK_BOTTOM_RIGHT
-                if (scalar_field(x, y+stepsize, z) < isovalue):
-                    case |= BACK_TOP_LEFT
-                if (scalar_field(x+stepsize, y+stepsize, z) < isovalue):
-                    case |= BACK_TOP_RIGHT
-                if (scalar_field(x, y, z+stepsize) < isovalue):
-                    case |= FRONT_BOTTOM_LEFT
-                if (scalar_field(x+stepsize, y, z+stepsize) < isovalue):
-                    case |= FRONT_BOTTOM_RIGHT
-                if (scalar_field(x, y+stepsize, z+stepsize) < isovalue):
-                    case |= FRONT_TOP_LEFT
-                if (scalar_field(x+stepsize, y+stepsize, z+stepsize) < isovalue):
-                    case |= FRONT_TOP_RIGHT
-
-                edge_indices = _lookup_configuration(case)
-
-                cube_vertices = _get_vertex_positions(edge_indices, (x, y, z), stepsize)
-
-                for vertex in cube_vertices:
-                    mesh_vertices.append(vertex)
+    if use_gpu:  # Select the array module to run the sweep with
+        if cupy is None:
+            raise ImportError("CuPy is required to run marching cubes on the GPU.")
+        xp = cupy
+    else:
+        xp = np
+
+    scalar_field = _ensure_vectorized(scalar_field)  # Wrap fields that cannot handle arrays
+
+    # The whole sweep runs in float32. The sweep is bound by the memory
+    # traffic of the sampled field planes, so halving their width roughly
+    # doubles its throughput, and single precision is plenty for geometry
+    # that is only ever rendered.
+    isovalue = np.float32(isovalue)
+
+    # Coordinate values of the grid of cube corners, along each axis. The
+    # cube count is the length np.arange(volume_min, volume_max, stepsize)
+    # would have, without materializing the array just to count it.
+    num_cubes = int(np.ceil((volume_max - volume_min) / stepsize))  # Cubes along each axis
+    host_corner_coords = np.arange(volume_min, volume_max + 2 * stepsize, stepsize,
+                                   dtype=np.float32)[:num_cubes + 1]
+    corner_coords = xp.asarray(host_corner_coords)
+
+    # Coarse pre-scan rejecting blocks of cubes that cannot cross the
+    # boundary. The pre-scan samples only a handful of points per block, so
+    # it runs on the host even when the sweep itself runs on the GPU; only
+    # its per-slab masks are transferred to the device.
+    if coarse_stride is not None and coarse_stride > 1:
+
+        block_bounds = np.arange(0, num_cubes + 1, coarse_stride)  # Fine-grid indices of block boundaries
+        if block_bounds[-1] != num_cubes:
+            block_bounds = np.append(block_bounds, num_cubes)
+
+        block_active = _active_blocks(scalar_field, isovalue, host_corner_coords, block_bounds)
+        cube_block = np.searchsorted(block_bounds, np.arange(num_cubes), side='right') - 1  # Block containing each cube
+
+    else:
+        block_active = None
+
+    # Sample the scalar field one plane of cube corners at a time. Each plane
+    # is shared by the slabs of cubes above and below it, so only two planes
+    # ever need to be held in memory, and each grid point is still evaluated
+    # exactly once rather than once per neighbouring cube.
+    X, Z = xp.meshgrid(corner_coords, corner_coords, indexing='ij')
+
+    plane_below = None  # Plane shared with the previous slab, when it was marched
+    for slab_index in range(num_cubes):
+
+        # Skip the slab entirely when every block it passes through was
+        # rejected by the pre-scan. The shared plane goes stale when skipping.
+        if block_active is not None and not block_active[:, cube_block[slab_index], :].any():
+            plane_below = None
+            continue
+
+        if plane_below is None:
+            plane_below = scalar_field(X, xp.full_like(X, corner_coords[slab_index]), Z).astype(np.float32, copy=False)
+
+        plane_above = scalar_field(X, xp.full_like(X, corner_coords[slab_index + 1]), Z).astype(np.float32, copy=False)
+        field_pair = xp.stack((plane_below, plane_above))
+
+        inside = field_pair < isovalue  # Test which grid points fall inside the object
+
+        # Build the bitmask for every cube in the slab at once. Each corner of
+        # a cube is one of the 8 corner-aligned slices of the two planes of
+        # inside/outside tests.
+        case = (BACK_BOTTOM_LEFT   * inside[0, :-1, :-1]
+              | BACK_BOTTOM_RIGHT  * inside[0, 1:, :-1]
+              | BACK_TOP_LEFT      * inside[1, :-1, :-1]
+              | BACK_TOP_RIGHT     * inside[1, 1:, :-1]
+              | FRONT_BOTTOM_LEFT  * inside[0, :-1, 1:]
+              | FRONT_BOTTOM_RIGHT * inside[0, 1:, 1:]
+              | FRONT_TOP_LEFT     * inside[1, :-1, 1:]
+              | FRONT_TOP_RIGHT    * inside[1, 1:, 1:])
+
+        # Find the cubes that straddle the object's boundary. Cubes entirely
+        # inside (case 255) or outside (case 0) the object produce no triangles.
+        crossing = (case != 0) & (case != 255)
+
+        if block_active is not None:  # Restrict the slab to its active blocks
+            block_row = block_active[:, cube_block[slab_index], :]
+            crossing &= xp.asarray(block_row[cube_block[:, np.newaxis], cube_block[np.newaxis, :]])
+
+        active_cubes = xp.argwhere(crossing)
+
+        if len(active_cubes) > 0:  # Generate the slab's triangle vertices in a single gather
+            cube_cases = case[active_cubes[:, 0], active_cubes[:, 1]]
+            slab_vertices = _get_vertex_positions(cube_cases, active_cubes, corner_coords,
+                                                  field_pair, slab_index, isovalue)
+
+            if use_gpu:  # Bring each finished slab back to the host
+                slab_vertices = cupy.asnumpy(slab_vertices)
+
+            yield slab_vertices.astype(np.float32, copy=False)
+
+        plane_below = plane_above  # Reuse the plane between the slabs sharing it
+
+
+def marching_cubes(scalar_field, isovalue, volume_min, volume_max, stepsize, use_gpu=False, coarse_stride=None):
+    """ Generates a triangle mesh of an object from a scalar field using
+    marching cubes. Marches the volume with marching_cubes_slabs and gathers
+    every slab's vertices into a single array; see that function for the
+    parameter descriptions, and use it directly to stream very large meshes
+    to disk instead of collecting them.
+
+    Returns
+    -------
+    mesh_vertices : np.ndarray
+        Vertices in the triangle mesh for the object generated by the
+        algorithm, as a float32 array of shape (M, 3)
+
+    """
+
+    slabs = marching_cubes_slabs(scalar_field, isovalue, volume_min, volume_max, stepsize,
+                                 use_gpu=use_gpu, coarse_stride=coarse_stride)
+
+    mesh_vertices = np.concatenate([np.empty((0, 3), dtype=np.float32)] + list(slabs))
+
+    return mesh_vertices
+
+
+# Expression defining each of the named scalar fields, used to generate
+# scalar-valued copies of them specialized for the compiled sweep
+_FIELD_EXPRESSIONS = {
+    "wavy": "y - math.sin(x) * math.cos(z)",
+    "hyperboloid": "x**2 - y**2 - z**2 - z",
+}
+
+@functools.lru_cache(maxsize=None)
+def _specialize_field(scalar_field_name):
+    """ Builds a scalar-valued copy of a named scalar field from its defining
+    expression. The generated function's body is the bare expression over
+    math intrinsics, so when Numba compiles the sweep the field folds into
+    the voxel loop as straight-line code with no function-call indirection.
+    Generated fields are cached so each name compiles only once.
+
+    Parameters
+    ----------
+    scalar_field_name : str
+        Name of one of the module's scalar fields ('wavy' or 'hyperboloid')
+
+    Returns
+    -------
+    scalar_field : function
+        Scalar field f(x, y, z) evaluated on scalars
+
+    """
+
+    if scalar_field_name not in _FIELD_EXPRESSIONS:
+        raise ValueError("Undefined scalar field: '{}'. Please enter one of the following options:\n'wavy', 'hyperboloid'".format(scalar_field_name))
+
+    source = "def scalar_field(x, y, z):\n    return {}".format(_FIELD_EXPRESSIONS[scalar_field_name])
+
+    namespace = {"math": math}
+    exec(source, namespace)
+
+    return namespace["scalar_field"]
+
+
+_JIT_KERNELS = {}  # Compiled kernels, cached per scalar field
+
+def _build_jit_kernel(scalar_field):
+    """ Builds a marching cubes kernel specialized to a scalar field, compiled
+    with Numba when it is installed.
+
+    Parameters
+    ----------
+    scalar_field : function
+        Scalar field f(x, y, z) evaluated on scalars. Must be compilable by
+        Numba (or already decorated with numba.njit) to benefit from the
+        compiled path.
+
+    Returns
+    -------
+    kernel : function
+        Kernel implementing the marching cubes sweep for the scalar field
+
+    """
+
+    if scalar_field in _JIT_KERNELS:
+        return _JIT_KERNELS[scalar_field]
+
+    if numba is not None and not hasattr(scalar_field, "py_func"):  # Compile the field unless already compiled
+        field = numba.njit(scalar_field)
+    else:
+        field = scalar_field
+
+    def kernel(isovalue, volume_min, stepsize, num_cubes,
+               tri_edges, tri_offsets, corner_offsets, edge_endpoints):
+
+        # First pass: count the triangle vertices produced by each slab of
+        # cubes, so that each slab can be filled independently in parallel
+        slab_counts = np.zeros(num_cubes, dtype=np.int64)
+
+        for j in prange(num_cubes):
+            y = volume_min + j * stepsize
+            for i in range(num_cubes):
+                x = volume_min + i * stepsize
+                for k in range(num_cubes):
+                    z = volume_min + k * stepsize
+
+                    # Test if each of the 8 corners of the cube fall inside or
+                    # outside of the object, and build up bitmask. Corner c
+                    # corresponds to bit c of the case. Accumulating the
+                    # comparison directly keeps the construction branchless.
+                    case = 0
+                    for c in range(8):
+                        value = field(x + stepsize * corner_offsets[c, 0],
+                                      y + stepsize * corner_offsets[c, 1],
+                                      z + stepsize * corner_offsets[c, 2])
+                        case |= (value < isovalue) << c
+
+                    slab_counts[j] += tri_offsets[case + 1] - tri_offsets[case]
+
+        # Offset where each slab's vertices begin in the output array
+        slab_starts = np.zeros(num_cubes + 1, dtype=np.int64)
+        slab_starts[1:] = np.cumsum(slab_counts)
+
+        # Second pass: recompute each cube's case and write its triangle
+        # vertices into the slab's section of the output array
+        vertices = np.empty((slab_starts[num_cubes], 3), dtype=np.float32)
+
+        for j in prange(num_cubes):
+            cursor = slab_starts[j]
+            y = volume_min + j * stepsize
+            corner_values = np.empty(8)
+            for i in range(num_cubes):
+                x = volume_min + i * stepsize
+                for k in range(num_cubes):
+                    z = volume_min + k * stepsize
+
+                    case = 0
+                    for c in range(8):
+                        corner_values[c] = field(x + stepsize * corner_offsets[c, 0],
+                                                 y + stepsize * corner_offsets[c, 1],
+                                                 z + stepsize * corner_offsets[c, 2])
+                        case |= (corner_values[c] < isovalue) << c
+
+                    # Cubes entirely inside or outside the object produce no
+                    # triangles; skip them before the lookup
+                    if case == 0 or case == 255:
+                        continue
+
+                    # Place each vertex where the field crosses the isovalue
+                    # along its edge, by linear interpolation between the
+                    # field values at the edge's endpoints
+                    for index in range(tri_offsets[case], tri_offsets[case + 1]):
+                        edge = tri_edges[index]
+                        a = edge_endpoints[edge, 0]
+                        b = edge_endpoints[edge, 1]
+                        interpolant = (isovalue - corner_values[a]) / (corner_values[b] - corner_values[a])
+
+                        vertices[cursor, 0] = x + stepsize * (corner_offsets[a, 0] + interpolant * (corner_offsets[b, 0] - corner_offsets[a, 0]))
+                        vertices[cursor, 1] = y + stepsize * (corner_offsets[a, 1] + interpolant * (corner_offsets[b, 1] - corner_offsets[a, 1]))
+                        vertices[cursor, 2] = z + stepsize * (corner_offsets[a, 2] + interpolant * (corner_offsets[b, 2] - corner_offsets[a, 2]))
+                        cursor += 1
+
+        return vertices
+
+    if numba is not None:
+        kernel = numba.njit(parallel=True, fastmath=True)(kernel)
+
+    _JIT_KERNELS[scalar_field] = kernel
+
+    return kernel
+
+
+def marching_cubes_jit(scalar_field, isovalue, volume_min, volume_max, stepsize):
+    """ Generates a triangle mesh of an object from a scalar field using
+    marching cubes, with the sweep compiled by Numba.
+
+    Fallback for scalar fields that cannot be evaluated on whole coordinate
+    arrays at once, which marching_cubes requires. The field is evaluated one
+    point at a time inside a Numba-compiled loop, so any field compilable with
+    numba.njit is supported. If Numba is not installed, the same loop runs in
+    plain (much slower) Python.
+
+    Parameters
+    ----------
+    scalar_field : function or str
+        Scalar field f(x, y, z) defining the object to generate a triangle
+        mesh of. The name of one of the module's fields ('wavy' or
+        'hyperboloid') may be given instead, in which case a scalar-valued
+        copy is generated from the field's defining expression, which
+        compiles into the sweep as straight-line code.
+    isovalue : float
+        Boundary value used to define which points are considered to be inside
+        of the object.
+    volume_min : int
+        Minimum value of x, y, and z to use in the algorithm.
+    volume_max : int
+        Maximum value of x, y, and z to use in the algorithm.
+    stepsize : float
+        Side length of each cube in the algorithm.
+
+    Returns
+    -------
+    mesh_vertices : np.ndarray
+        Vertices in the triangle mesh for the object generated by the
+        algorithm, as a float32 array of shape (M, 3)
+
+    """
+
+    if isinstance(scalar_field, str):  # Generate a specialized copy of a named field
+        scalar_field = _specialize_field(scalar_field)
+
+    num_cubes = int(np.ceil((volume_max - volume_min) / stepsize))  # Cubes along each axis
+
+    kernel = _build_jit_kernel(scalar_field)
+    mesh_vertices = kernel(float(isovalue), float(volume_min), float(stepsize), num_cubes,
+                           TRI_EDGES, TRI_OFFSETS, CORNER_OFFSETS, EDGE_ENDPOINTS)
 
     return mesh_vertices
 
@@ -434,38 +936,33 @@ def compute_normals(vertices):
 
     Parameters
     ----------
-    vertices : list[float]
-        Vertices in the triangle mesh
-    
+    vertices : np.ndarray
+        Vertices in the triangle mesh, as an array of shape (M, 3)
+
     Returns
     -------
-    normals : list[float]
-        Normal vectors for each vertex in the triangle mesh
-    
-    """
+    normals : np.ndarray
+        Normal vectors for each vertex in the triangle mesh, as an array of
+        shape (M, 3)
 
-    normals = []  # Normal vectors for each vertex in the triangle mesh
+    """
 
-    # Iterate over each triangle in the triangle mesh
-    for index in np.arange(0, len(vertices), 9):
-        
-        # Define each vertex of the triangle
-        vertexA = glm.vec3(vertices[index], vertices[index+1], vertices[index+2])
-        vertexB = glm.vec3(vertices[index+3], vertices[index+4], vertices[index+5])
-        vertexC = glm.vec3(vertices[index+6], vertices[index+7], vertices[index+8])
+    # Group the vertices into triangles
+    triangles = np.asarray(vertices, dtype=np.float32).reshape(-1, 3, 3)
 
-        # Define triangle edges
-        edgeA = vertexB - vertexA
-        edgeB = vertexC - vertexA
+    # Define the edges of every triangle
+    edge_a = triangles[:, 1] - triangles[:, 0]
+    edge_b = triangles[:, 2] - triangles[:, 0]
 
-        # Compute cross product and normalize for normal vector
-        normal = glm.normalize(glm.cross(edgeA, edgeB))
+    # Compute cross products and normalize for the normal of each triangle.
+    # Degenerate (zero-area) triangles divide by zero here and keep their
+    # undefined normals, as the previous glm-based implementation did.
+    triangle_normals = np.cross(edge_a, edge_b)
+    with np.errstate(invalid='ignore'):
+        triangle_normals /= np.linalg.norm(triangle_normals, axis=1, keepdims=True)
 
-        # Add normal to the list 3 times (once for each vertex of the triangle)
-        for i in range(3):
-            normals.append(normal.x)
-            normals.append(normal.y)
-            normals.append(normal.z)
+    # Repeat each triangle's normal once for each of its 3 vertices
+    normals = np.repeat(triangle_normals, 3, axis=0)
 
     return normals
 
@@ -475,17 +972,21 @@ def writePLY(vertices, normals, filename, comment=None):
 
     Parameters
     ----------
-    vertices : list[int]
-        Vertices in the triangle mesh
-    normals : list[int]
-        Normal vectors for each vertex in the triangle mesh
+    vertices : np.ndarray
+        Vertices in the triangle mesh, as an array of shape (M, 3)
+    normals : np.ndarray
+        Normal vectors for each vertex in the triangle mesh, as an array of
+        shape (M, 3)
     filename : str
         Filename of PLY file to write triangle mesh to
     comment : str
         Comment line to write in PLY file
-    
+
     """
 
+    vertices = np.asarray(vertices, dtype=np.float32).ravel()
+    normals = np.asarray(normals, dtype=np.float32).ravel()
+
     # Get filepath to file
     directory = os.path.dirname(os.path.abspath(__file__))
     filepath = os.path.join(directory, filename)
@@ -493,57 +994,143 @@ def writePLY(vertices, normals, filename, comment=None):
     num_vertices = int(len(vertices)/3)   # Each vertex has 3 coordinates (x, y, z)
     num_faces = int(num_vertices/3)       # 3 vertices make up 1 triangle face
 
-    # Write data to file
-    with open(filepath, "w") as file:
-        
+    # Write data to file. The file is opened in binary mode with a large
+    # buffer so the data blocks are flushed to disk in big writes instead of
+    # line by line; PLY headers are plain ASCII either way.
+    with open(filepath, "wb", buffering=1 << 20) as file:
+
         # Header
-        file.write("ply\n")
-        file.write("format ascii 1.0\n")
-        file.write("comment {}\n".format(comment))
+        file.write(b"ply\n")
+        file.write(b"format ascii 1.0\n")
+        file.write("comment {}\n".format(comment).encode("ascii"))
+
+        # Vertex metadata
+        file.write("element vertex {}\n".format(num_vertices).encode("ascii"))
+        file.write(b"property float x\nproperty float y\nproperty float z\n")
+        file.write(b"property float nx\nproperty float ny\nproperty float nz\n")
+
+        # Triangle face metadata
+        file.write("element face {}\n".format(num_faces).encode("ascii"))
+        file.write(b"property list uchar uint vertex_indices\n")
+
+        file.write(b"end_header\n")
+
+        # Vertex data, written as one block of position and normal columns.
+        # %.9g keeps enough digits for float32 values to round-trip exactly.
+        vertex_data = np.concatenate((vertices.reshape(-1, 3), normals.reshape(-1, 3)), axis=1)
+        np.savetxt(file, vertex_data, fmt="%.9g")
+
+        # Triangle face indices, written as one block of index rows prefixed
+        # by the number of vertices per face
+        face_indices = np.arange(num_vertices, dtype=np.uint32).reshape(-1, 3)
+        faces = np.column_stack((np.full(num_faces, 3, dtype=np.uint32), face_indices))
+        np.savetxt(file, faces, fmt="%d")
+
+
+def writePLY_stream(slabs, filename, comment=None):
+    """ Writes a triangle mesh to a binary PLY file one slab of vertices at a
+    time, computing each slab's normals as it arrives.
+
+    Companion to marching_cubes_slabs: no more than one slab of the mesh is
+    ever held in memory, so arbitrarily large meshes can be written. The
+    vertex count is not known until the last slab has been consumed, so the
+    header is written with space-padded placeholder counts which are patched
+    in place once the mesh is complete.
+
+    Parameters
+    ----------
+    slabs : iterable of np.ndarray
+        Batches of triangle mesh vertices, each as a float32 array of shape
+        (k, 3) with k a multiple of 3, as yielded by marching_cubes_slabs
+    filename : str
+        Filename of PLY file to write triangle mesh to
+    comment : str
+        Comment line to write in PLY file
+
+    """
+
+    # Get filepath to file
+    directory = os.path.dirname(os.path.abspath(__file__))
+    filepath = os.path.join(directory, filename)
+
+    with open(filepath, "wb", buffering=1 << 20) as file:
+
+        # Header. The element counts are unknown until every slab has been
+        # written, so reserve fixed-width fields to overwrite at the end.
+        file.write(b"ply\n")
+        file.write(b"format binary_little_endian 1.0\n")
+        file.write("comment {}\n".format(comment).encode("ascii"))
 
         # Vertex metadata
-        file.write("element vertex {}\n".format(num_vertices))  
-        file.write("property float x\nproperty float y\nproperty float z\n")
-        file.write("property float nx\nproperty float ny\nproperty float nz\n")
-        
+        file.write(b"element vertex ")
+        vertex_count_offset = file.tell()
+        file.write(b"%-12d\n" % 0)
+        file.write(b"property float x\nproperty float y\nproperty float z\n")
+        file.write(b"property float nx\nproperty float ny\nproperty float nz\n")
+
         # Triangle face metadata
-        file.write("element face {}\n".format(num_faces))  
-        file.write("property list uchar uint vertex_indices\n")
+        file.write(b"element face ")
+        face_count_offset = file.tell()
+        file.write(b"%-12d\n" % 0)
+        file.write(b"property list uchar uint vertex_indices\n")
+
+        file.write(b"end_header\n")
+
+        # Vertex data, written slab by slab as packed little-endian float32
+        # position and normal columns
+        num_vertices = 0
+        for slab_vertices in slabs:
+            slab_vertices = np.asarray(slab_vertices, dtype=np.float32).reshape(-1, 3)
+            if len(slab_vertices) == 0:
+                continue
+            slab_normals = compute_normals(slab_vertices)
+            file.write(np.hstack((slab_vertices, slab_normals)).astype('<f4', copy=False))
+            num_vertices += len(slab_vertices)
+
+        # Triangle face indices, packed as a uchar vertex count followed by
+        # 3 uint32 indices per face. The indices are just a running sequence,
+        # so the records are generated and written in fixed-size chunks to
+        # keep the writer's memory use independent of the mesh size.
+        num_faces = int(num_vertices / 3)
+        face_dtype = np.dtype([("count", "u1"), ("indices", "<u4", (3,))])
+        chunk_size = 1 << 16  # Faces per chunk
 
-        file.write("end_header\n")
+        for start in range(0, num_faces, chunk_size):
+            chunk = np.empty(min(chunk_size, num_faces - start), dtype=face_dtype)
+            chunk["count"] = 3
+            chunk["indices"] = np.arange(3 * start, 3 * start + 3 * len(chunk), dtype=np.uint32).reshape(-1, 3)
+            file.write(chunk)
 
-        # Vertex data
-        for i in np.arange(0, len(vertices), 3):  # Iterate over each vertex
-            file.write("{} {} {} {} {} {}\n".format(vertices[i], vertices[i+1], vertices[i+2],
-                                                    normals[i], normals[i+1], normals[i+2]))
+        # Patch the reserved header fields with the final counts
+        file.seek(vertex_count_offset)
+        file.write(b"%-12d" % num_vertices)
+        file.seek(face_count_offset)
+        file.write(b"%-12d" % num_faces)
 
-        # Triangle face indices
-        for i in np.arange(0, num_vertices, 3):  # Iterate over groups of vertex indices forming each face
-            file.write("3 {} {} {}\n".format(i, i+1, i+2))
 
+if __name__ == "__main__":
 
-# Validate input and unpack arguments
-if (len(sys.argv) == 7):
-    _, filename, scalar_field_name, isovalue, volume_min, volume_max, stepsize = sys.argv
-else:  # Invalid input
-    raise TypeError("Expected 6 arguments but {} were given.".format(len(sys.argv) - 1))
+    # Validate input and unpack arguments
+    if (len(sys.argv) == 7):
+        _, filename, scalar_field_name, isovalue, volume_min, volume_max, stepsize = sys.argv
+    else:  # Invalid input
+        raise TypeError("Expected 6 arguments but {} were given.".format(len(sys.argv) - 1))
 
 
-# Define scalar field function to use from input
-if (scalar_field_name == "wavy"):
-    scalar_field = wavy
-elif (scalar_field_name == "hyperboloid"):
-    scalar_field = hyperboloid
-else:  # Invalid input
-    raise ValueError("Undefined scalar field: '{}'. Please enter one of the following options:\n'wavy', 'hyperboloid'".format(scalar_field_name))
+    # Define scalar field function to use from input
+    if (scalar_field_name == "wavy"):
+        scalar_field = wavy
+    elif (scalar_field_name == "hyperboloid"):
+        scalar_field = hyperboloid
+    else:  # Invalid input
+        raise ValueError("Undefined scalar field: '{}'. Please enter one of the following options:\n'wavy', 'hyperboloid'".format(scalar_field_name))
 
 
-# Run marching cubes algorithm and save result
-vertices = marching_cubes(scalar_field, float(isovalue), int(volume_min), int(volume_max), float(stepsize))  # Generate vertex positions
-normals = compute_normals(vertices)    # Compute normals
+    # Run marching cubes algorithm and stream the result to a binary PLY
+    # file, computing normals and writing one slab of cubes at a time
+    slabs = marching_cubes_slabs(scalar_field, float(isovalue), int(volume_min), int(volume_max), float(stepsize))
 
-# Save to file
-comment = "Scalar field: '{}', Isovalue: {}, Min. volume: {}, Max. volume: {}, Stepsize: {}".format(scalar_field_name, isovalue, volume_min, volume_max, stepsize)
-writePLY(vertices, normals, filename, comment)
+    comment = "Scalar field: '{}', Isovalue: {}, Min. volume: {}, Max. volume: {}, Stepsize: {}".format(scalar_field_name, isovalue, volume_min, volume_max, stepsize)
+    writePLY_stream(slabs, filename, comment)
 
-print("Marching cubes computation complete!")
\ No newline at end of file
+    print("Marching cubes computation complete!")
\ No newline at end of file
@@ -1,8 +1,13 @@
 # Author: Joelene Hales, 2024
 
 from OpenGL.GL import *
+import ctypes
 import glfw
 import glm
+import hashlib
+import io
+import math
+import mmap
 import os
 import sys
 import numpy as np
@@ -29,9 +34,19 @@ glfw.make_context_current(window)
 project_directory = os.path.dirname(os.path.abspath(__file__))
 shader_directory = os.path.join(project_directory, "Shaders")
 
+# NumPy dtype corresponding to each property type name used in PLY headers.
+# Used to assemble the structured dtype of a binary-format vertex record.
+_PLY_PROPERTY_TYPES = {"char": "i1", "uchar": "u1",
+                       "short": "<i2", "ushort": "<u2",
+                       "int": "<i4", "uint": "<u4",
+                       "float": "<f4", "double": "<f8"}
+
+
 # Helper functions
 def readPLY(filename):
-    """ Reads a PLY file.
+    """ Reads a PLY file. Both the ascii and binary_little_endian formats are
+    supported; binary files are read directly into arrays at memcpy speed,
+    with no per-value parsing.
 
     Parameters
     ----------
@@ -40,8 +55,12 @@ def readPLY(filename):
 
     Returns
     -------
-    vertices, normals, faces : list[float], list[float], list[int]
-        Vertex positions, normals, and triangle faces in the triangle mesh.
+    vertices, normals : np.ndarray
+        Vertex positions and normals in the triangle mesh, as float32 arrays
+        of shape (N, 3).
+    faces : np.ndarray
+        Vertex indices of each triangle face, as a uint32 array of shape
+        (num_faces, 3).
 
     """
 
@@ -49,91 +68,109 @@ def readPLY(filename):
     directory = os.path.dirname(os.path.abspath(__file__))
     filepath = os.path.join(directory, filename)
 
-    with open(filepath, "r") as file:
-
-        # Read formatting and comments
-        filetype = file.readline().strip("\n")
-        format = file.readline().strip("\n")
-        comment = file.readline().strip("\n")
-
-        # Read number of vertices
-        line = file.readline().strip().split(" ")
-        num_vertices = int(line[2])
-
-        # Create empty arrays to store each vertex's attributes
-        vertex_data = {"x" : np.empty(num_vertices),
-                        "y" : np.empty(num_vertices),
-                        "z" : np.empty(num_vertices),
-                        "nx" : np.empty(num_vertices),
-                        "ny" : np.empty(num_vertices),
-                        "nz" : np.empty(num_vertices),
-                        "r" : np.empty(num_vertices),
-                        "g" : np.empty(num_vertices),
-                        "b" : np.empty(num_vertices),
-                        "u" : np.empty(num_vertices),
-                        "v" : np.empty(num_vertices)}
-
-        # Determine which value in each vertex data line corresponds to each attribute
-        attribute_indices = {}  # Stores each index in the line and the attribute it corresponds to
-        line_num = 0            # Used to iterate until the end of the vertex property information
-        while (line_num < len(vertex_data)): 
-
-            line = file.readline().strip().split()  # Split the line's data into components
-
-            if (line[0] == "element"):  # Beginning of triangle face properties begin
-                break
-            else:
-                # Store the current position and its corresponding attribute
-                attribute_indices[line_num] = line[2]
-                line_num += 1
+    # Map the whole file into memory, so the data blocks can be handed to
+    # NumPy as a single buffer instead of streaming through Python file IO
+    with open(filepath, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if hasattr(mmap, "MADV_SEQUENTIAL"):  # Hint that the mapping is read front to back
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+
+    # Split the header from the data blocks. The header is ASCII text in both
+    # formats and always ends with the same marker line.
+    header_end = mapping.find(b"end_header\n") + len(b"end_header\n")
+    header = iter(mapping[:header_end].decode("ascii").splitlines())
+
+    # Read formatting and comments
+    filetype = next(header)
+    format = next(header)
+    comment = next(header)
+
+    is_binary = "binary_little_endian" in format
+
+    # Read number of vertices
+    line = next(header).strip().split(" ")
+    num_vertices = int(line[2])
+
+    # Create empty arrays to store each vertex's attributes
+    vertex_data = {"x" : np.empty(num_vertices),
+                    "y" : np.empty(num_vertices),
+                    "z" : np.empty(num_vertices),
+                    "nx" : np.empty(num_vertices),
+                    "ny" : np.empty(num_vertices),
+                    "nz" : np.empty(num_vertices),
+                    "r" : np.empty(num_vertices),
+                    "g" : np.empty(num_vertices),
+                    "b" : np.empty(num_vertices),
+                    "u" : np.empty(num_vertices),
+                    "v" : np.empty(num_vertices)}
+
+    # Determine which value in each vertex data line corresponds to each attribute
+    attribute_indices = {}  # Stores each index in the line and the attribute it corresponds to
+    property_types = []     # Stores each attribute's declared type, in order
+    line_num = 0            # Used to iterate until the end of the vertex property information
+    while (line_num < len(vertex_data)):
+
+        line = next(header).strip().split()  # Split the line's data into components
+
+        if (line[0] == "element"):  # Beginning of triangle face properties begin
+            break
+        else:
+            # Store the current position and its corresponding attribute and type
+            attribute_indices[line_num] = line[2]
+            property_types.append(line[1])
+            line_num += 1
 
-        # Read number of faces
-        num_faces = int(line[2])
+    # Read number of faces
+    num_faces = int(line[2])
 
-        # Skip format of triangle faces and end of header lines
-        next(file)
-        next(file)
+    # Read vertex data from the mapping
+    if is_binary:
 
-        # Read vertex data from file
-        for index in range(num_vertices):  # Iterate over each vertex
+        # Assemble a structured dtype matching the declared properties and
+        # view the packed vertex records in place, with no copy at all
+        vertex_dtype = np.dtype([(attribute_indices[i], _PLY_PROPERTY_TYPES[property_types[i]])
+                                 for i in range(len(property_types))])
+        data = np.frombuffer(mapping, dtype=vertex_dtype, count=num_vertices, offset=header_end)
 
-            vertex = file.readline().strip().split(" ")  # Split the line's data into components
+        for attribute in vertex_dtype.names:
+            vertex_data[attribute] = data[attribute]
 
-            for i in range(len(vertex)):  # Iterate over each attribute
+    else:
 
-                attribute = attribute_indices[i]  # Lookup which attribute the value in this position corrresponds to
-                vertex_data[attribute][index] = float(vertex[i])  # Add attribute to correct list
+        # The whole vertex block is parsed in one vectorized read, then
+        # each column is matched to its attribute. The reshape keeps empty
+        # and single-vertex blocks two-dimensional.
+        body = io.BytesIO(mapping[header_end:])
+        data = np.loadtxt(body, dtype=np.float32, max_rows=num_vertices).reshape(-1, len(property_types))
 
-        # Read vertex positions and normals
-        vertices = []
-        normals = []
+        for i, attribute in attribute_indices.items():
+            vertex_data[attribute] = data[:, i]
 
-        for i in range(num_vertices):
+    # Read vertex positions and normals, stacked into one row per vertex
+    vertices = np.stack((vertex_data['x'], vertex_data['y'], vertex_data['z']), axis=1).astype(np.float32, copy=False)
+    normals = np.stack((vertex_data['nx'], vertex_data['ny'], vertex_data['nz']), axis=1).astype(np.float32, copy=False)
 
-            vertices.append(vertex_data['x'][i])
-            vertices.append(vertex_data['y'][i])
-            vertices.append(vertex_data['z'][i])
+    # Read triangle face indices
+    if is_binary:
 
-            normals.append(vertex_data['nx'][i])
-            normals.append(vertex_data['ny'][i])
-            normals.append(vertex_data['nz'][i])
+        # Each packed face record is a vertex count followed by 3 indices,
+        # viewed in place directly after the vertex block
+        face_dtype = np.dtype([("count", "u1"), ("indices", "<u4", (3,))])
+        faces = np.frombuffer(mapping, dtype=face_dtype, count=num_faces,
+                              offset=header_end + num_vertices * vertex_dtype.itemsize)["indices"].ravel()
 
-        # Read triangle face indices from file
-        faces = []
-        while(len(faces) < num_faces):  # Repeat until all faces have been read
+    else:
 
-            # Read indices from file
-            indices = file.readline().strip().split(" ")  # Split line into 3 indices
-            faces.append(indices[1])
-            faces.append(indices[2])
-            faces.append(indices[3])
+        # The remaining lines are the face block; parse it in one
+        # vectorized read and drop the leading vertex-count column
+        face_data = np.loadtxt(body, dtype=np.uint32, max_rows=num_faces).reshape(-1, 4)
+        faces = face_data[:, 1:4]
 
-        # Convert to arrays
-        vertices = np.array(vertices, dtype=np.float32)
-        normals = np.array(normals, dtype=np.float32)
-        faces = np.array(faces, dtype=np.uint32)
+    # Convert to an array, one row per face
+    faces = np.array(faces, dtype=np.uint32).reshape(-1, 3)
 
-        return vertices, normals, faces
+    return vertices, normals, faces
 
 
 def matrix_to_array(matrix, dimensions):
@@ -149,15 +186,163 @@ def matrix_to_array(matrix, dimensions):
     Returns
     -------
     matrix_array : np.ndarray
-        Matrix converted to an array.
-    
+        Matrix converted to an array. The array is a zero-copy view over the
+        matrix's memory, in the same column-major order the elements were
+        previously gathered in, so it is only valid while the matrix is alive.
+
     """
-    
-    matrix_array = np.array([matrix[i][j] for i in range(dimensions) for j in range(dimensions)])
+
+    matrix_array = np.ctypeslib.as_array(glm.value_ptr(matrix), shape=(dimensions * dimensions,))
 
     return matrix_array
 
 
+# Shader source codes, each read from disk exactly once at module load
+_SIMPLE_VERTEX_SHADER = open(os.path.join(shader_directory, "simple.vs"), "r").read()
+_SIMPLE_FRAGMENT_SHADER = open(os.path.join(shader_directory, "simple.fs"), "r").read()
+_PHONG_VERTEX_SHADER = open(os.path.join(shader_directory, "phong.vs"), "r").read()
+_PHONG_FRAGMENT_SHADER = open(os.path.join(shader_directory, "phong.fs"), "r").read()
+
+
+def _build_program(vertex_shader_code, fragment_shader_code):
+    """ Compiles and links a shader program from a pair of shader sources.
+
+    Linked programs are cached on disk as driver program binaries, keyed by a
+    hash of the shader source, so later runs can reload the binary and skip
+    the driver's GLSL compiler entirely. The cache is best-effort: a stale or
+    unsupported binary simply falls back to compiling from source.
+
+    Parameters
+    ----------
+    vertex_shader_code : str
+        Source code of the vertex shader
+    fragment_shader_code : str
+        Source code of the fragment shader
+
+    Returns
+    -------
+    program_ID : int
+        Handle of the linked shader program
+
+    """
+
+    # Locate the program's cached binary. Keying by the source code means any
+    # edit to either shader misses the cache and recompiles.
+    source_hash = hashlib.sha256((vertex_shader_code + fragment_shader_code).encode()).hexdigest()
+    cache_directory = os.path.join(os.path.expanduser("~"), ".cache", "marching_cubes")
+    cache_path = os.path.join(cache_directory, source_hash + ".bin")
+
+    # Try to reload a cached binary. A driver or hardware change can make the
+    # binary stale, which the link status reports; compile from source then.
+    if os.path.exists(cache_path):
+
+        with open(cache_path, "rb") as file:
+            binary_format = int.from_bytes(file.read(4), "little")
+            binary = file.read()
+
+        program_ID = glCreateProgram()
+        try:
+            glProgramBinary(program_ID, binary_format, binary, len(binary))
+            if glGetProgramiv(program_ID, GL_LINK_STATUS):
+                return program_ID
+        except Exception:
+            pass  # Binary rejected by the driver; fall through to compiling
+        glDeleteProgram(program_ID)
+
+    # Create vertex and fragment shaders
+    vertex_shader_ID = glCreateShader(GL_VERTEX_SHADER)
+    fragment_shader_ID = glCreateShader(GL_FRAGMENT_SHADER)
+
+    # Compile Vertex Shader
+    glShaderSource(vertex_shader_ID, vertex_shader_code)
+    glCompileShader(vertex_shader_ID)
+
+    # Check for compilation error
+    if not(glGetShaderiv(vertex_shader_ID, GL_COMPILE_STATUS)):
+        raise RuntimeError(glGetShaderInfoLog(vertex_shader_ID))
+
+    # Compile Fragment Shader
+    glShaderSource(fragment_shader_ID, fragment_shader_code)
+    glCompileShader(fragment_shader_ID)
+
+    # Check for compilation error
+    if not(glGetShaderiv(fragment_shader_ID, GL_COMPILE_STATUS)):
+        raise RuntimeError(glGetShaderInfoLog(fragment_shader_ID))
+
+    # Link shader program and attach shaders
+    program_ID = glCreateProgram()
+
+    glAttachShader(program_ID, vertex_shader_ID)
+    glAttachShader(program_ID, fragment_shader_ID)
+    glProgramParameteri(program_ID, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)  # Ask the driver to keep the binary retrievable
+    glLinkProgram(program_ID)
+
+    glDetachShader(program_ID, vertex_shader_ID)
+    glDetachShader(program_ID, fragment_shader_ID)
+
+    glDeleteShader(vertex_shader_ID)
+    glDeleteShader(fragment_shader_ID)
+
+    # Save the linked binary for future runs. Retrieval is optional in the
+    # driver, so a failure here only means the next run compiles again.
+    try:
+        binary_length = glGetProgramiv(program_ID, GL_PROGRAM_BINARY_LENGTH)
+        if binary_length > 0:
+
+            length = GLsizei()
+            binary_format = GLenum()
+            binary = (GLubyte * binary_length)()
+            glGetProgramBinary(program_ID, binary_length, length, binary_format, binary)
+
+            os.makedirs(cache_directory, exist_ok=True)
+            with open(cache_path, "wb") as file:
+                file.write(int(binary_format.value).to_bytes(4, "little"))
+                file.write(bytes(binary[:length.value]))
+    except Exception:
+        pass  # The driver does not support program binaries
+
+    return program_ID
+
+
+# Each shader program is shared by every object drawn with it, so each pair
+# of shaders is compiled and linked exactly once
+simple_program_ID = _build_program(_SIMPLE_VERTEX_SHADER, _SIMPLE_FRAGMENT_SHADER)
+phong_program_ID = _build_program(_PHONG_VERTEX_SHADER, _PHONG_FRAGMENT_SHADER)
+
+
+# Corner vertices of a unit cube and the vertex indices forming each of its
+# edges. Shared by every Volume instance and scaled to the marching volume.
+_BOX_CORNERS = np.array([[0, 0, 0],
+                         [1, 0, 0],
+                         [0, 0, 1],
+                         [1, 0, 1],
+                         [0, 1, 0],
+                         [1, 1, 0],
+                         [0, 1, 1],
+                         [1, 1, 1]], dtype=np.float32)
+
+_BOX_EDGES = np.array([0, 1, 0, 2, 1, 3, 2, 3,
+                       4, 5, 4, 6, 5, 7, 6, 7,
+                       1, 5, 3, 7, 0, 4, 2, 6], dtype=np.uint32)
+
+# Endpoint vertices of each unit axis and the color it is drawn in. Shared by
+# every Axis instance and scaled to the marching volume.
+_AXIS_VERTICES = {'x': np.array([[0, 0, 0], [1, 0, 0]], dtype=np.float32),
+                  'y': np.array([[0, 0, 0], [0, 1, 0]], dtype=np.float32),
+                  'z': np.array([[0, 0, 0], [0, 0, 1]], dtype=np.float32)}
+
+_AXIS_COLORS = {'x': glm.vec3(1.0, 0.0, 0.0),
+                'y': glm.vec3(0.0, 1.0, 0.0),
+                'z': glm.vec3(0.0, 0.0, 1.0)}
+
+# RGB value of each base color the triangle mesh can be drawn in
+_COLORS = {"turquoise": glm.vec3(0.0, 1.0, 1.0),
+           "fuchsia": glm.vec3(1.0, 0.0, 0.667),
+           "lime": glm.vec3(0.667, 1.0, 0.0),
+           "orange": glm.vec3(1.0, 0.667, 0.0),
+           "purple": glm.vec3(0.667, 0.0, 1.0)}
+
+
 # Main rendering classes
 class Volume():
     """ Class used to draw a box around the marching volume. """
@@ -175,70 +360,12 @@ class Volume():
         
         """
 
-        # Define corner vertices of marching volume
-        volume_vertices = [volume_min, volume_min, volume_min,
-                           volume_max, volume_min, volume_min,
-                           volume_min, volume_min, volume_max,
-                           volume_max, volume_min, volume_max,
-                           volume_min, volume_max, volume_min,
-                           volume_max, volume_max, volume_min,
-                           volume_min, volume_max, volume_max,
-                           volume_max, volume_max, volume_max]
-
-        # Define vertex indices forming each edge of the marching volume
-        endpoint_indices = [0, 1,
-                            0, 2,
-                            1, 3,
-                            2, 3,
-                            4, 5,
-                            4, 6,
-                            5, 7,
-                            6, 7,
-                            1, 5,
-                            3, 7,
-                            0, 4,
-                            2, 6]
-
-        # Convert to arrays
-        volume_vertices = np.array(volume_vertices, dtype=np.float32)
-        endpoint_indices = np.array(endpoint_indices, dtype=np.uint32)
-
-        # Import shader codes from file
-        vertex_shader_code = open(os.path.join(shader_directory, "simple.vs"), "r").read()
-        fragment_shader_code = open(os.path.join(shader_directory, "simple.fs"), "r").read()
-
-        # Create vertex and fragment shaders
-        vertex_shader_ID = glCreateShader(GL_VERTEX_SHADER)
-        fragment_shader_ID = glCreateShader(GL_FRAGMENT_SHADER)
-
-        # Compile Vertex Shader
-        glShaderSource(vertex_shader_ID, vertex_shader_code)
-        glCompileShader(vertex_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(vertex_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(vertex_shader_ID))
-
-        # Compile Fragment Shader
-        glShaderSource(fragment_shader_ID, fragment_shader_code)
-        glCompileShader(fragment_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(fragment_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(fragment_shader_ID))
-
-        # Link shader program and attach shaders
-        self.program_ID = glCreateProgram()
-
-        glAttachShader(self.program_ID, vertex_shader_ID)
-        glAttachShader(self.program_ID, fragment_shader_ID)
-        glLinkProgram(self.program_ID)
-
-        glDetachShader(self.program_ID, vertex_shader_ID)
-        glDetachShader(self.program_ID, fragment_shader_ID)
-
-        glDeleteShader(vertex_shader_ID)
-        glDeleteShader(fragment_shader_ID)
+        # Scale the shared unit-cube corners to the marching volume
+        volume_vertices = (volume_min + (volume_max - volume_min) * _BOX_CORNERS).ravel()
+        endpoint_indices = _BOX_EDGES
+
+        # Use the shared shader program
+        self.program_ID = simple_program_ID
 
         # Get handle for uniform variables
         self.MVP = glGetUniformLocation(self.program_ID, "MVP")
@@ -278,21 +405,17 @@ class Volume():
         
         Parameters
 		----------
-		MVP : glm.mat4
-			Model view projection matrix.
+		MVP : np.ndarray
+			Model view projection matrix, marshalled with matrix_to_array.
             
         """
 
-        # Enable blending
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
         # Use program
         glUseProgram(self.program_ID)
 
         # Set uniform variables
         glUniform3f(self.color_uniform, 1, 1, 1)  # White color
-        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, matrix_to_array(MVP, 4))
+        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, MVP)
 
         # Bind VAO to restore captured state (buffer bindings and attribute specifications)
         glBindVertexArray(self.VAO)
@@ -304,8 +427,6 @@ class Volume():
         glBindVertexArray(0)
         glUseProgram(0)
 
-        glDisable(GL_BLEND)
-
 
 class Axis():
     """ Class used to draw an axis of the marching voliume. """
@@ -325,63 +446,17 @@ class Axis():
         
         """
 
-        # Define vertices and color depending on axis specified
-        if (which_axis == 'x'):
-            vertices = [volume_min, volume_min, volume_min,
-                        volume_max, volume_min, volume_min]
-            self.color = glm.vec3(1.0, 0.0, 0.0)
-            
+        # Scale the shared unit-axis endpoints to the marching volume and
+        # look up the axis color. Unknown axis names draw the z axis, as the
+        # if/elif chain this replaces did.
+        unit_vertices = _AXIS_VERTICES.get(which_axis, _AXIS_VERTICES['z'])
+        vertices = (volume_min + (volume_max - volume_min) * unit_vertices).ravel()
+        self.color = _AXIS_COLORS.get(which_axis, _AXIS_COLORS['z'])
 
-        elif (which_axis == 'y'):
-            vertices = [volume_min, volume_min, volume_min,
-                        volume_min, volume_max, volume_min]
-            self.color = glm.vec3(0.0, 1.0, 0.0)
-
-        else:
-            vertices = [volume_min, volume_min, volume_min,
-                        volume_min, volume_min, volume_max]
-            self.color = glm.vec3(0.0, 0.0, 1.0)
-
-        vertices = np.array(vertices, dtype=np.float32)
         self.num_vertices = len(vertices)
 
-        # Import shader codes from file
-        vertex_shader_code = open(os.path.join(shader_directory, "simple.vs"), "r").read()
-        fragment_shader_code = open(os.path.join(shader_directory, "simple.fs"), "r").read()
-
-
-        # Create vertex and fragment shaders
-        vertex_shader_ID = glCreateShader(GL_VERTEX_SHADER)
-        fragment_shader_ID = glCreateShader(GL_FRAGMENT_SHADER)
-
-        # Compile Vertex Shader
-        glShaderSource(vertex_shader_ID, vertex_shader_code)
-        glCompileShader(vertex_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(vertex_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(vertex_shader_ID))
-
-        # Compile Fragment Shader
-        glShaderSource(fragment_shader_ID, fragment_shader_code)
-        glCompileShader(fragment_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(fragment_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(fragment_shader_ID))
-
-        # Link shader program and attach shaders
-        self.program_ID = glCreateProgram()
-
-        glAttachShader(self.program_ID, vertex_shader_ID)
-        glAttachShader(self.program_ID, fragment_shader_ID)
-        glLinkProgram(self.program_ID)
-
-        glDetachShader(self.program_ID, vertex_shader_ID)
-        glDetachShader(self.program_ID, fragment_shader_ID)
-
-        glDeleteShader(vertex_shader_ID)
-        glDeleteShader(fragment_shader_ID)
+        # Use the shared shader program
+        self.program_ID = simple_program_ID
 
         # Get handle for each uniform
         self.MVP = glGetUniformLocation(self.program_ID, "MVP")
@@ -415,20 +490,16 @@ class Axis():
         
         Parameters
 		----------
-		MVP : glm.mat4
-			Model view projection matrix.
+		MVP : np.ndarray
+			Model view projection matrix, marshalled with matrix_to_array.
             
         """
 
-        # Enable blending
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
         # Use program
         glUseProgram(self.program_ID)
 
         # Set uniform variables
-        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, matrix_to_array(MVP, 4))
+        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, MVP)
         glUniform3f(self.color_uniform, self.color.x, self.color.y, self.color.z)
 
         # Bind VAO to restore captured state (buffer bindings and attribute specifications)
@@ -440,7 +511,6 @@ class Axis():
         # Unbind VAO and texture, clean up shader program
         glBindVertexArray(0)
         glUseProgram(0)
-        glDisable(GL_BLEND)
 
 
 class TriangleMesh():
@@ -458,47 +528,12 @@ class TriangleMesh():
         """
 
         # Read triangle mesh from PLY file
-        vertices, normals, _ = readPLY(filename)  # Face indices not required when using glDrawArrays()
-        self.num_vertices = len(vertices)
-
-
-        # Import shader codes from file
-        Phong_vertex_shader = open(os.path.join(shader_directory, "phong.vs"), "r").read()
-        Phong_fragment_shader = open(os.path.join(shader_directory, "phong.fs"), "r").read()
-        
-
-        # Create vertex and fragment shaders
-        vertex_shader_ID = glCreateShader(GL_VERTEX_SHADER)
-        fragment_shader_ID = glCreateShader(GL_FRAGMENT_SHADER)
-
-        # Compile Vertex Shader
-        glShaderSource(vertex_shader_ID, Phong_vertex_shader)
-        glCompileShader(vertex_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(vertex_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(vertex_shader_ID))
-
-        # Compile Fragment Shader
-        glShaderSource(fragment_shader_ID, Phong_fragment_shader)
-        glCompileShader(fragment_shader_ID)
-
-        # Check for compilation error
-        if not(glGetShaderiv(fragment_shader_ID, GL_COMPILE_STATUS)):
-            raise RuntimeError(glGetShaderInfoLog(fragment_shader_ID))
+        vertices, normals, faces = readPLY(filename)
+        self.num_indices = faces.size
 
-        # Link shader program and attach shaders
-        self.program_ID = glCreateProgram()
 
-        glAttachShader(self.program_ID, vertex_shader_ID)
-        glAttachShader(self.program_ID, fragment_shader_ID)
-        glLinkProgram(self.program_ID)
-
-        glDetachShader(self.program_ID, vertex_shader_ID)
-        glDetachShader(self.program_ID, fragment_shader_ID)
-
-        glDeleteShader(vertex_shader_ID)
-        glDeleteShader(fragment_shader_ID)
+        # Use the shared shader program
+        self.program_ID = phong_program_ID
 
         # Get handle for each uniform
         self.MVP = glGetUniformLocation(self.program_ID, "MVP")
@@ -511,38 +546,52 @@ class TriangleMesh():
         self.VAO = glGenVertexArrays(1)
         glBindVertexArray(self.VAO)
 
-		# Create and bind VBO for vertex data
+        # Quantize each normal to three signed 10-bit components packed into
+        # one 32-bit word. The fragment shader renormalizes, so 10 bits per
+        # axis loses nothing visible, and the normal stream shrinks from 12
+        # to 4 bytes per vertex. Degenerate (nan) normals quantize to zero.
+        quantized = (np.clip(np.nan_to_num(normals), -1.0, 1.0) * 511).astype(np.int32) & 0x3FF
+        packed_normals = (quantized[:, 0] | (quantized[:, 1] << 10) | (quantized[:, 2] << 20)).astype(np.uint32)
+
+        # Interleave each vertex's position and packed normal into one
+        # 16-byte record, so the GPU fetches both attributes from a single
+        # contiguous stream
+        interleaved = np.empty((len(vertices), 4), dtype=np.float32)
+        interleaved[:, 0:3] = vertices
+        interleaved[:, 3] = packed_normals.view(np.float32)
+
+		# Create and bind VBO for the interleaved vertex data
         self.vertex_VBO = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.vertex_VBO)
-        glBufferData(GL_ARRAY_BUFFER, np.dtype(np.float32).itemsize*self.num_vertices, vertices, GL_STATIC_DRAW)
+        glBufferData(GL_ARRAY_BUFFER, interleaved.nbytes, interleaved, GL_STATIC_DRAW)
 
 		# Set vertex attributes
         glEnableVertexAttribArray(0)
         glVertexAttribPointer(
-            0,            # Attribute number
-            3,            # Size (Number of components)
-            GL_FLOAT,     # Type
-            GL_FALSE,     # Normalized?
-            0,            # Stride (Byte offset)
-            None          # Offset
+            0,                    # Attribute number
+            3,                    # Size (Number of components)
+            GL_FLOAT,             # Type
+            GL_FALSE,             # Normalized?
+            16,                   # Stride (Byte offset)
+            ctypes.c_void_p(0)    # Offset
         )
 
-		# Create and bind VBO for normal vectors
-        self.normal_VBO = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, self.normal_VBO)
-        glBufferData(GL_ARRAY_BUFFER, np.dtype(np.float32).itemsize*self.num_vertices, normals, GL_STATIC_DRAW)
-
 		# Set normal attributes
         glEnableVertexAttribArray(1)
         glVertexAttribPointer(
-            1,            # Attribute number
-            3,            # Size (Number of components)
-            GL_FLOAT,     # Type
-            GL_TRUE,      # Normalized?
-            0,            # Stride (Byte offset)
-            None          # Offset
+            1,                        # Attribute number
+            4,                        # Size (Number of components)
+            GL_INT_2_10_10_10_REV,    # Type (packed signed 10-bit normal)
+            GL_TRUE,                  # Normalized?
+            16,                       # Stride (Byte offset)
+            ctypes.c_void_p(12)       # Offset
         )
 
+		# Create and bind EBO for triangle face indices
+        self.face_EBO = glGenBuffers(1)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.face_EBO)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, faces.nbytes, faces, GL_STATIC_DRAW)
+
         glBindVertexArray(0)  # Unbind VAO
 
 
@@ -551,12 +600,12 @@ class TriangleMesh():
         
         Parameters
 		----------
-		MVP : glm.mat4
-			Model view projection matrix.
-        V : glm.mat4
-            View matrix
-        M : glm.mat4
-            Model matrix
+		MVP : np.ndarray
+			Model view projection matrix, marshalled with matrix_to_array.
+        V : np.ndarray
+            View matrix, marshalled with matrix_to_array
+        M : np.ndarray
+            Model matrix, marshalled with matrix_to_array
         LightDir : glm.vec3
             Direction of the light source
         modelColor : glm.vec3
@@ -564,17 +613,13 @@ class TriangleMesh():
             
         """
         
-        # Enable blending
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-
 		# Use program
         glUseProgram(self.program_ID)
 
         # Set uniform variables
-        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, matrix_to_array(MVP, 4))
-        glUniformMatrix4fv(self.V, 1, GL_FALSE, matrix_to_array(V, 4))
-        glUniformMatrix4fv(self.M, 1, GL_FALSE, matrix_to_array(M, 4))
+        glUniformMatrix4fv(self.MVP, 1, GL_FALSE, MVP)
+        glUniformMatrix4fv(self.V, 1, GL_FALSE, V)
+        glUniformMatrix4fv(self.M, 1, GL_FALSE, M)
         glUniform3f(self.LightDir, LightDir.x, LightDir.y, LightDir.z)
         glUniform4f(self.modelColor, modelColor.x, modelColor.y, modelColor.z, 1.0)
 
@@ -582,12 +627,11 @@ class TriangleMesh():
         glBindVertexArray(self.VAO)
 
         # Draw triangles
-        glDrawArrays(GL_TRIANGLES, 0, self.num_vertices)
+        glDrawElements(GL_TRIANGLES, self.num_indices, GL_UNSIGNED_INT, None)
 
         # Unbind VAO and texture, clean up shader program
         glBindVertexArray(0)
         glUseProgram(0)
-        glDisable(GL_BLEND)
 
 
 
@@ -610,9 +654,11 @@ class Camera():
 
 
         # Calculate radius, theta, and phi values by converting center coordinate from Cartesian spherical coordinates
-        self.radius = np.sqrt(center.x**2 + center.y**2 + center.z**2)
-        self.theta = np.arctan(center.z / center.x)
-        self.phi = np.arccos(center.y / self.radius)
+        self.radius = math.sqrt(center.x**2 + center.y**2 + center.z**2)
+        self.theta = math.atan(center.z / center.x)
+        self.phi = math.acos(center.y / self.radius)
+
+        self._position = None  # Cached Cartesian position, recomputed only after the camera moves
 
 
     def rotatePhi(self, increment):
@@ -628,10 +674,11 @@ class Camera():
         """
 
         self.phi += increment
-        
+        self._position = None
+
         # Clamp between epsilon and pi - epsilon to prevent vector from flipping and producing unwanted effects
         epsilon = 0.001
-        self.phi = max(min(self.phi, max(epsilon, np.pi - epsilon)), min(epsilon, np.pi - epsilon))
+        self.phi = max(min(self.phi, max(epsilon, math.pi - epsilon)), min(epsilon, math.pi - epsilon))
 
 
     def rotateTheta(self, increment):
@@ -646,6 +693,7 @@ class Camera():
         """
 
         self.theta += increment
+        self._position = None
 
 
     def zoomRadius(self, increment):
@@ -661,6 +709,7 @@ class Camera():
         """
 
         self.radius += increment
+        self._position = None
 
         # Do not let radius become negative
         if (self.radius <= 0.0001):
@@ -668,7 +717,9 @@ class Camera():
 
 
     def get_position(self):
-        """ Calculates the camera's position in Cartesian coordinates. 
+        """ Calculates the camera's position in Cartesian coordinates. The
+        position only changes when the camera moves, so it is cached between
+        calls and only recomputed after a rotation or zoom.
         
         Returns
         -------
@@ -677,14 +728,16 @@ class Camera():
 
         """
 
-        # Calculate each coordinate from spherical coordinates
-        x = self.radius * np.cos(self.theta) * np.sin(self.phi)
-        y = self.radius * np.cos(self.phi)
-        z = self.radius * np.sin(self.theta) * np.sin(self.phi)
+        if (self._position is None):  # Camera has moved since the last call
 
-        position = glm.vec3(x, y, z)  # Camera position, in Cartesian coordinates
+            # Calculate each coordinate from spherical coordinates
+            x = self.radius * math.cos(self.theta) * math.sin(self.phi)
+            y = self.radius * math.cos(self.phi)
+            z = self.radius * math.sin(self.theta) * math.sin(self.phi)
 
-        return position
+            self._position = glm.vec3(x, y, z)  # Camera position, in Cartesian coordinates
+
+        return self._position
 
 
 # Validate input and unpack arguments
@@ -698,17 +751,8 @@ else:  # Invalid input
 
 
 # Define RGB value for given color name
-if (color_name.lower() == "turquoise"):
-    model_color = glm.vec3(0.0, 1.0, 1.0)
-elif (color_name.lower() == "fuchsia"):
-    model_color = glm.vec3(1.0, 0.0, 0.667)
-elif (color_name.lower() == "lime"):
-    model_color = glm.vec3(0.667, 1.0, 0.0)
-elif (color_name.lower() == "orange"):
-    model_color = glm.vec3(1.0, 0.667, 0.0)
-elif (color_name.lower() == "purple"):
-    model_color = glm.vec3(0.667, 0.0, 1.0)
-else:
+model_color = _COLORS.get(color_name.lower())
+if (model_color is None):  # Invalid input
     raise ValueError("Undefined color: '{}'. Please enter one of the following options:\n'turquoise', 'lime', 'orange', 'purple', 'fuchsia'".format(color_name))
 
 
@@ -745,6 +789,11 @@ dr = 0          # Proportional to (time up arrow key was held) - (time down arro
 # Define direction of light source
 light_direction = glm.vec3(0.0, 10.0, 10.0)
 
+# The model matrix never changes, so marshal it to an array once
+M_array = matrix_to_array(M, 4)
+
+prev_camera_state = None  # Camera state of the last frame drawn, used to skip redraws
+
 # Ensure we can capture the escape key being pressed
 glfw.set_input_mode(window, glfw.STICKY_KEYS, GL_TRUE)
 
@@ -752,13 +801,15 @@ glfw.set_input_mode(window, glfw.STICKY_KEYS, GL_TRUE)
 glEnable(GL_DEPTH_TEST)
 glDepthFunc(GL_LESS)
 
+# Constant render state, set once instead of every frame: the background
+# color and the blend function every draw call previously re-toggled
+glClearColor(0.2, 0.2, 0.3, 0.0)  # Dark blue
+glEnable(GL_BLEND)
+glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
 # Render loop
 while (glfw.get_key(window, glfw.KEY_ESCAPE) != glfw.PRESS and not glfw.window_should_close(window)):  # Repeat until escape key is pressed or window is closed
 
-    # Clear buffers and set background color
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-    glClearColor(0.2, 0.2, 0.3, 0.0)  # Dark blue
-
     glfw.poll_events()  # Poll for events
 
     # Process up and down arrow key presses
@@ -800,24 +851,38 @@ while (glfw.get_key(window, glfw.KEY_ESCAPE) != glfw.PRESS and not glfw.window_s
     camera.rotateTheta(0.005 * dx)   # Modify theta based on horizontal drag motion
     camera.rotatePhi(-0.005 * dy)    # Modify phi based on vertical drag motion
 
+    # When the camera has not moved, the frame on screen is still correct;
+    # skip the redraw and sleep until input arrives instead of spinning
+    camera_state = (camera.radius, camera.theta, camera.phi)
+    if (camera_state == prev_camera_state):
+        glfw.wait_events_timeout(0.1)
+        continue
+    prev_camera_state = camera_state
+
+    # Clear buffers
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
     # Set view matrix to use new camera position
     V = glm.lookAt(camera.get_position(), eye, up)
 
     # Calculate model view projection matrix
     MVP = P * V * M
 
+    # Marshal this frame's matrices to arrays once, shared by every draw call
+    MVP_array = matrix_to_array(MVP, 4)
+    V_array = matrix_to_array(V, 4)
+
     # Draw marching volume boundary and axes
-    x_axis.draw(MVP)
-    y_axis.draw(MVP)
-    z_axis.draw(MVP)
-    volume.draw(MVP)
+    x_axis.draw(MVP_array)
+    y_axis.draw(MVP_array)
+    z_axis.draw(MVP_array)
+    volume.draw(MVP_array)
 
     # Render triangle mesh
-    triangle_mesh.draw(MVP, V, M, light_direction, model_color)
+    triangle_mesh.draw(MVP_array, V_array, M_array, light_direction, model_color)
 
     # Swap buffers
     glfw.swap_buffers(window)
-    glfw.poll_events()
 
 
 # Close OpenGL window and terminate GLFW